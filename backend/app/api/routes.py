@@ -1,10 +1,12 @@
 import math
 import os
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Annotated
 from uuid import uuid4
 
+import anyio
 from fastapi import APIRouter, Body, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile
 from pydantic import BaseModel, Field
 
@@ -31,6 +33,24 @@ hands_dir.mkdir(parents=True, exist_ok=True)
 auth_settings = AuthSettings.from_env(repo_root=repo_root)
 auth_service = AuthService(store=AuthStore(auth_settings.db_path), settings=auth_settings)
 
+# Upper bound for a long-polling hands request.
+MAX_HANDS_WAIT_SECONDS = 10.0
+# Long-poll waits block a thread each, so they run on their own limiter instead of the threadpool
+# that serves every sync route; once it is full, further long-polls answer immediately.
+MAX_CONCURRENT_HANDS_WAITS = 16
+_hands_wait_limiter = anyio.CapacityLimiter(MAX_CONCURRENT_HANDS_WAITS)
+
+
+async def _wait_for_new_hands(service: MatchService, after_hand_id: int | None, wait_seconds: float) -> None:
+    if after_hand_id is None or wait_seconds <= 0:
+        return
+    if _hands_wait_limiter.available_tokens < 1:
+        return
+    await anyio.to_thread.run_sync(
+        partial(service.wait_for_hands, after=after_hand_id, timeout=wait_seconds),
+        limiter=_hands_wait_limiter,
+    )
+
 
 def _update_persistent_leaderboard(
     hand: HandRecord,
@@ -41,20 +61,15 @@ def _update_persistent_leaderboard(
     if big_blind <= 0:
         return
 
-    updated_at = int(hand.completed_at.timestamp())
-    for seat_id in hand.active_seats:
-        bot_id = seat_bot_ids.get(seat_id)
-        if bot_id is None:
-            continue
-        delta_bb = hand.deltas.get(seat_id, 0.0) / big_blind
-        existing = auth_service.store.get_leaderboard_row(bot_id)
-        hands_played = (existing["hands_played"] if existing else 0) + 1
-        bb_won = (existing["bb_won"] if existing else 0.0) + delta_bb
-        auth_service.store.upsert_leaderboard_row(
-            bot_id=bot_id,
-            hands_played=hands_played,
-            bb_won=bb_won,
-            updated_at=updated_at,
+    entries = [
+        (seat_bot_ids[seat_id], hand.deltas.get(seat_id, 0.0) / big_blind)
+        for seat_id in hand.active_seats
+        if seat_id in seat_bot_ids
+    ]
+    if entries:
+        auth_service.store.record_leaderboard_hand(
+            entries,
+            updated_at=int(hand.completed_at.timestamp()),
         )
 
 
@@ -502,23 +517,25 @@ def reset_table_match(
 
 
 @router.get("/tables/{table_id}/hands")
-def list_table_hands(
+async def list_table_hands(
     table_id: str,
     current_user: dict = Depends(require_authenticated_user),
     limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=1000)] = 100,
     max_hand_id: Annotated[int | None, Query(ge=0)] = None,
+    after_hand_id: Annotated[int | None, Query(ge=0)] = None,
+    wait_seconds: Annotated[float, Query(ge=0, le=MAX_HANDS_WAIT_SECONDS)] = 0.0,
 ) -> dict:
     del current_user
-    _, service = get_table_service(table_id)
+    # The lookup hits SQLite and may open the table's hand store, so keep it off the event loop.
+    _, service = await anyio.to_thread.run_sync(get_table_service, table_id)
+    await _wait_for_new_hands(service, after_hand_id, wait_seconds)
     if limit is not None:
         page_size = limit
         page = 1
     hands = service.list_hands(limit=limit, page=page, page_size=page_size, max_hand_id=max_hand_id)
-    total_hands = service.get_match()["hands_played"]
-    if max_hand_id is not None:
-        total_hands = min(max_hand_id, total_hands)
+    total_hands = service.count_hands(max_hand_id=max_hand_id)
     total_pages = math.ceil(total_hands / page_size) if total_hands else 0
     return {
         "hands": hands,
@@ -537,8 +554,7 @@ def get_table_pnl(
 ) -> dict:
     del current_user
     _, service = get_table_service(table_id)
-    entries, last_hand_id = service.list_pnl(since_hand_id=since_hand_id)
-    return {"entries": entries, "last_hand_id": last_hand_id}
+    return service.list_pnl(since_hand_id=since_hand_id)
 
 
 @router.get("/tables/{table_id}/leaderboard")
@@ -650,19 +666,20 @@ def reset_match() -> dict:
 
 
 @router.get("/hands")
-def list_hands(
+async def list_hands(
     limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=1000)] = 100,
     max_hand_id: Annotated[int | None, Query(ge=0)] = None,
+    after_hand_id: Annotated[int | None, Query(ge=0)] = None,
+    wait_seconds: Annotated[float, Query(ge=0, le=MAX_HANDS_WAIT_SECONDS)] = 0.0,
 ) -> dict:
+    await _wait_for_new_hands(match_service, after_hand_id, wait_seconds)
     if limit is not None:
         page_size = limit
         page = 1
     hands = match_service.list_hands(limit=limit, page=page, page_size=page_size, max_hand_id=max_hand_id)
-    total_hands = match_service.get_match()["hands_played"]
-    if max_hand_id is not None:
-        total_hands = min(max_hand_id, total_hands)
+    total_hands = match_service.count_hands(max_hand_id=max_hand_id)
     total_pages = math.ceil(total_hands / page_size) if total_hands else 0
     return {
         "hands": hands,
@@ -677,8 +694,7 @@ def list_hands(
 def get_pnl(
     since_hand_id: Annotated[int | None, Query(ge=0)] = None,
 ) -> dict:
-    entries, last_hand_id = match_service.list_pnl(since_hand_id=since_hand_id)
-    return {"entries": entries, "last_hand_id": last_hand_id}
+    return match_service.list_pnl(since_hand_id=since_hand_id)
 
 
 @router.get("/leaderboard")
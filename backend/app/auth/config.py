@@ -16,6 +16,8 @@ class AuthSettings:
     bootstrap_username: str
     bootstrap_password: str
     db_path: Path
+    # Minimum-cost hashing for tests; stored hashes still verify under either setting.
+    password_hash_low_cost: bool = False
 
     @classmethod
     def from_env(cls, repo_root: Path) -> "AuthSettings":
@@ -6,19 +6,24 @@ from typing import Final
 ARGON2_PREFIX: Final[str] = "$argon2"
 HASH_SCHEME_ARGON2ID: Final[str] = "argon2id"
 HASH_SCHEME_BCRYPT: Final[str] = "bcrypt"
+BCRYPT_LOW_COST_ROUNDS: Final[int] = 4
 
 
 class PasswordHasher:
-    def __init__(self) -> None:
+    def __init__(self, low_cost: bool = False) -> None:
         self._argon2 = None
         self._bcrypt = None
+        self._bcrypt_rounds = BCRYPT_LOW_COST_ROUNDS if low_cost else None
         self.scheme = HASH_SCHEME_BCRYPT
 
         try:
             from argon2 import PasswordHasher as Argon2PasswordHasher
             from argon2.low_level import Type
 
-            self._argon2 = Argon2PasswordHasher(type=Type.ID)
+            if low_cost:
+                self._argon2 = Argon2PasswordHasher(time_cost=1, memory_cost=8, parallelism=1, type=Type.ID)
+            else:
+                self._argon2 = Argon2PasswordHasher(type=Type.ID)
             self.scheme = HASH_SCHEME_ARGON2ID
             return
         except ImportError:
@@ -34,7 +39,8 @@ class PasswordHasher:
     def hash_password(self, plain_password: str) -> str:
         if self._argon2 is not None:
             return self._argon2.hash(plain_password)
-        return self._bcrypt.hashpw(plain_password.encode("utf-8"), self._bcrypt.gensalt()).decode("utf-8")
+        salt = self._bcrypt.gensalt() if self._bcrypt_rounds is None else self._bcrypt.gensalt(self._bcrypt_rounds)
+        return self._bcrypt.hashpw(plain_password.encode("utf-8"), salt).decode("utf-8")
 
     def verify_password(self, password_hash: str, plain_password: str) -> bool:
         if password_hash.startswith(ARGON2_PREFIX):
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Callable
 
 from app.auth.config import AuthSettings
 from app.auth.security import PasswordHasher
@@ -18,14 +19,21 @@ class AuthLockedError(AuthError):
 
 
 class AuthService:
-    def __init__(self, store: AuthStore, settings: AuthSettings) -> None:
+    def __init__(
+        self,
+        store: AuthStore,
+        settings: AuthSettings,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self.store = store
         self.settings = settings
-        self.password_hasher = PasswordHasher()
+        self.password_hasher = PasswordHasher(low_cost=settings.password_hash_low_cost)
+        # Wall-clock seconds; timestamps are persisted, so this must not be a monotonic clock.
+        self._clock = clock
         self._bootstrap_default_user()
 
     def _now(self) -> int:
-        return int(time.time())
+        return int(self._clock())
 
     def _normalize_username(self, username: str) -> str:
         return username.strip().lower()
@@ -103,10 +111,7 @@ class AuthService:
     def get_user_from_session(self, session_id: str | None) -> dict | None:
         if not session_id:
             return None
-        session = self.store.get_valid_session(session_id=session_id, now_ts=self._now())
-        if session is None:
-            return None
-        user = self.store.get_user_by_id(session["user_id"])
+        user = self.store.get_session_user(session_id=session_id, now_ts=self._now())
         if user is None:
             return None
         return self._public_user(user)
@@ -4,9 +4,79 @@ import sqlite3
 import threading
 import time
 import uuid
+from collections.abc import Iterable, Mapping
 from pathlib import Path
 
 
+# Applied in order; a version is skipped once recorded in schema_migrations.
+_MIGRATIONS: tuple[tuple[int, str], ...] = (
+    (
+        1,
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id TEXT PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            invalidated_at INTEGER,
+            FOREIGN KEY(user_id) REFERENCES users(user_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id);
+        CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
+        CREATE TABLE IF NOT EXISTS login_attempts (
+            username TEXT PRIMARY KEY,
+            failure_count INTEGER NOT NULL,
+            first_failed_at INTEGER NOT NULL,
+            last_failed_at INTEGER NOT NULL,
+            locked_until INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS bot_records (
+            bot_id TEXT PRIMARY KEY,
+            owner_user_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            version TEXT NOT NULL,
+            artifact_path TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            FOREIGN KEY(owner_user_id) REFERENCES users(user_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_bot_records_owner_user_id
+            ON bot_records(owner_user_id, created_at DESC);
+        """,
+    ),
+    (
+        2,
+        """
+        CREATE TABLE IF NOT EXISTS table_records (
+            table_id TEXT PRIMARY KEY,
+            created_by_user_id TEXT NOT NULL,
+            small_blind REAL NOT NULL,
+            big_blind REAL NOT NULL,
+            status TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            FOREIGN KEY(created_by_user_id) REFERENCES users(user_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_table_records_created_at
+            ON table_records(created_at DESC, table_id DESC);
+        CREATE TABLE IF NOT EXISTS leaderboard_rows (
+            bot_id TEXT PRIMARY KEY,
+            hands_played INTEGER NOT NULL,
+            bb_won REAL NOT NULL,
+            updated_at INTEGER NOT NULL,
+            FOREIGN KEY(bot_id) REFERENCES bot_records(bot_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_leaderboard_rows_rank
+            ON leaderboard_rows(hands_played DESC, bb_won DESC, bot_id DESC);
+        """,
+    ),
+)
+
+
 class AuthStore:
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
@@ -18,15 +88,18 @@ class AuthStore:
     def _connect(self) -> sqlite3.Connection:
         connection = sqlite3.connect(self._db_path, timeout=5.0)
         connection.row_factory = sqlite3.Row
+        self._configure_connection(connection)
         return connection
 
     def _configure_connection(self, connection: sqlite3.Connection) -> None:
+        # These settings are per connection, so every connection applies them, not just _init_db's.
+        # NORMAL is crash-safe under WAL and avoids an fsync on every commit.
         connection.executescript(
             """
-            PRAGMA journal_mode=WAL;
-            PRAGMA synchronous=FULL;
+            PRAGMA synchronous=NORMAL;
             PRAGMA foreign_keys=ON;
             PRAGMA secure_delete=ON;
+            PRAGMA temp_store=MEMORY;
             """
         )
 
@@ -50,7 +123,8 @@ class AuthStore:
 
     def _init_db(self) -> None:
         with self._connect() as connection:
-            self._configure_connection(connection)
+            # journal_mode is stored in the database file, so setting it once here is enough.
+            connection.execute("PRAGMA journal_mode=WAL")
             existing_tables = self._list_tables(connection)
             self._ensure_migrations_table(connection)
             if self._is_legacy_schema(existing_tables):
@@ -63,7 +137,7 @@ class AuthStore:
                 )
 
             current_version = self._current_schema_version(connection)
-            for version, migration_sql in self._ordered_migrations():
+            for version, migration_sql in _MIGRATIONS:
                 if version <= current_version:
                     continue
                 connection.executescript(migration_sql)
@@ -108,74 +182,6 @@ class AuthStore:
             return 0
         return int(row["version"])
 
-    def _ordered_migrations(self) -> list[tuple[int, str]]:
-        return [
-            (
-                1,
-                """
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id TEXT PRIMARY KEY,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    created_at INTEGER NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS sessions (
-                    session_id TEXT PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    created_at INTEGER NOT NULL,
-                    expires_at INTEGER NOT NULL,
-                    invalidated_at INTEGER,
-                    FOREIGN KEY(user_id) REFERENCES users(user_id)
-                );
-                CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id);
-                CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
-                CREATE TABLE IF NOT EXISTS login_attempts (
-                    username TEXT PRIMARY KEY,
-                    failure_count INTEGER NOT NULL,
-                    first_failed_at INTEGER NOT NULL,
-                    last_failed_at INTEGER NOT NULL,
-                    locked_until INTEGER
-                );
-                CREATE TABLE IF NOT EXISTS bot_records (
-                    bot_id TEXT PRIMARY KEY,
-                    owner_user_id TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    version TEXT NOT NULL,
-                    artifact_path TEXT NOT NULL,
-                    created_at INTEGER NOT NULL,
-                    FOREIGN KEY(owner_user_id) REFERENCES users(user_id)
-                );
-                CREATE INDEX IF NOT EXISTS idx_bot_records_owner_user_id
-                    ON bot_records(owner_user_id, created_at DESC);
-                """,
-            ),
-            (
-                2,
-                """
-                CREATE TABLE IF NOT EXISTS table_records (
-                    table_id TEXT PRIMARY KEY,
-                    created_by_user_id TEXT NOT NULL,
-                    small_blind REAL NOT NULL,
-                    big_blind REAL NOT NULL,
-                    status TEXT NOT NULL,
-                    created_at INTEGER NOT NULL,
-                    FOREIGN KEY(created_by_user_id) REFERENCES users(user_id)
-                );
-                CREATE INDEX IF NOT EXISTS idx_table_records_created_at
-                    ON table_records(created_at DESC, table_id DESC);
-                CREATE TABLE IF NOT EXISTS leaderboard_rows (
-                    bot_id TEXT PRIMARY KEY,
-                    hands_played INTEGER NOT NULL,
-                    bb_won REAL NOT NULL,
-                    updated_at INTEGER NOT NULL,
-                    FOREIGN KEY(bot_id) REFERENCES bot_records(bot_id)
-                );
-                CREATE INDEX IF NOT EXISTS idx_leaderboard_rows_rank
-                    ON leaderboard_rows(hands_played DESC, bb_won DESC, bot_id DESC);
-                """,
-            ),
-        ]
-
     def create_user(self, username: str, password_hash: str, now_ts: int) -> dict:
         with self._lock, self._connect() as connection:
             user_id = str(uuid.uuid4())
@@ -229,24 +235,21 @@ class AuthStore:
             connection.commit()
         return {"session_id": session_id, "expires_at": expires_at}
 
-    def get_valid_session(self, session_id: str, now_ts: int) -> dict | None:
+    def get_session_user(self, session_id: str, now_ts: int) -> dict | None:
+        """User behind a live session, in one query instead of a session then a user lookup."""
         with self._connect() as connection:
             row = connection.execute(
                 """
-                SELECT session_id, user_id, created_at, expires_at, invalidated_at
+                SELECT users.user_id, users.username, users.password_hash, users.created_at
                 FROM sessions
-                WHERE session_id = ?
+                JOIN users ON users.user_id = sessions.user_id
+                WHERE sessions.session_id = ?
+                  AND sessions.invalidated_at IS NULL
+                  AND sessions.expires_at > ?
                 """,
-                (session_id,),
+                (session_id, now_ts),
             ).fetchone()
-            if row is None:
-                return None
-            session = dict(row)
-            if session["invalidated_at"] is not None:
-                return None
-            if session["expires_at"] <= now_ts:
-                return None
-            return session
+            return dict(row) if row is not None else None
 
     def invalidate_session(self, session_id: str, now_ts: int) -> None:
         with self._lock, self._connect() as connection:
@@ -465,6 +468,43 @@ class AuthStore:
             "updated_at": updated_at,
         }
 
+    def upsert_leaderboard_rows(self, rows: Iterable[Mapping[str, object]]) -> None:
+        """Upsert many rows (same keys as upsert_leaderboard_row) in one transaction."""
+        with self._lock, self._connect() as connection:
+            connection.executemany(
+                """
+                INSERT INTO leaderboard_rows (bot_id, hands_played, bb_won, updated_at)
+                VALUES (:bot_id, :hands_played, :bb_won, :updated_at)
+                ON CONFLICT(bot_id) DO UPDATE SET
+                    hands_played = excluded.hands_played,
+                    bb_won = excluded.bb_won,
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+            connection.commit()
+
+    def record_leaderboard_hand(
+        self,
+        entries: Iterable[tuple[str, float]],
+        *,
+        updated_at: int,
+    ) -> None:
+        """Add one played hand and its bb result to each (bot_id, delta_bb) entry."""
+        with self._lock, self._connect() as connection:
+            connection.executemany(
+                """
+                INSERT INTO leaderboard_rows (bot_id, hands_played, bb_won, updated_at)
+                VALUES (?, 1, ?, ?)
+                ON CONFLICT(bot_id) DO UPDATE SET
+                    hands_played = hands_played + 1,
+                    bb_won = bb_won + excluded.bb_won,
+                    updated_at = excluded.updated_at
+                """,
+                [(bot_id, delta_bb, updated_at) for bot_id, delta_bb in entries],
+            )
+            connection.commit()
+
     def get_leaderboard_row(self, bot_id: str) -> dict | None:
         with self._connect() as connection:
             row = connection.execute(
@@ -1,34 +1,59 @@
 from __future__ import annotations
 
+import hashlib
 import io
 import zipfile
+from collections import OrderedDict
+from threading import Lock
 
 from app.bots.manifest import parse_manifest, select_manifest_member
 from app.bots.security import validate_archive_infos
 
+# Results for recently validated archives, keyed by content digest so payloads are not retained.
+VALIDATION_CACHE_SIZE = 128
+_validation_cache: OrderedDict[bytes, tuple[bool, str | None]] = OrderedDict()
+_validation_cache_lock = Lock()
+
 
 def validate_bot_archive(payload: bytes) -> tuple[bool, str | None]:
     if not payload:
         return False, "Upload payload is empty"
 
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    with _validation_cache_lock:
+        result = _validation_cache.get(digest)
+        if result is not None:
+            _validation_cache.move_to_end(digest)
+            return result
+
+    result = _validate_archive(payload)
+    with _validation_cache_lock:
+        _validation_cache[digest] = result
+        if len(_validation_cache) > VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+    return result
+
+
+def _validate_archive(payload: bytes) -> tuple[bool, str | None]:
     try:
         with zipfile.ZipFile(io.BytesIO(payload)) as archive:
             is_valid, error_message = validate_archive_infos(archive.infolist())
             if not is_valid:
                 return False, error_message
 
-            manifest_member, manifest_error = select_manifest_member(archive.namelist())
+            archive_names = archive.namelist()
+            manifest_member, manifest_error = select_manifest_member(archive_names)
             if manifest_member is None:
                 return False, manifest_error or "bot.json must exist at zip root or one top-level folder"
 
             manifest_info = archive.getinfo(manifest_member)
             with archive.open(manifest_info) as manifest_file:
-                manifest, error = parse_manifest(
+                parsed_manifest, error = parse_manifest(
                     raw_manifest=manifest_file.read(),
                     manifest_member=manifest_member,
-                    archive_names=archive.namelist(),
+                    archive_names=archive_names,
                 )
-            if manifest is None:
+            if parsed_manifest is None:
                 return False, error or "Invalid bot manifest"
             return True, None
     except zipfile.BadZipFile:
@@ -75,6 +75,8 @@ class PokerEngine:
         small_blind_cents: int = 50,
         big_blind_cents: int = 100,
     ) -> None:
+        # Deck order must not be predictable from dealt cards, so shuffles default to the OS CSPRNG;
+        # tests inject a seeded Random.
         self.rng = rng or SystemRandom()
         self.starting_stack_cents = starting_stack_cents
         self.small_blind_cents = small_blind_cents
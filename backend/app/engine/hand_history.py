@@ -17,9 +17,10 @@ def format_hand_history(
     actions: list[ActionEvent],
     small_blind_cents: int,
     big_blind_cents: int,
+    played_at: datetime | None = None,
 ) -> str:
     """Return a readable poker-hand-history text blob for the MVP engine."""
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    timestamp = (played_at or datetime.now(timezone.utc)).strftime("%Y-%m-%d %H:%M:%S UTC")
     lines: list[str] = []
 
     lines.append(f"Hand #{hand_id}")
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 from hashlib import sha256
 from pathlib import Path
 
@@ -32,8 +33,16 @@ def _resolve_asset_version(frontend_dir: Path, app_version: str) -> str:
     return digest.hexdigest()[:12] or app_version
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # Stop match loops and close every table's hand log and flusher thread.
+    api_routes.match_service.close()
+    api_routes.table_runtime_manager.close()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Poker Bots Playground", version="0.1.0")
+    app = FastAPI(title="Poker Bots Playground", version="0.1.0", lifespan=_lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -1,9 +1,15 @@
+import math
+import os
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from threading import Event, Lock, Thread, current_thread
+from operator import itemgetter
+from threading import Condition, Event, RLock, Thread, current_thread
+from time import monotonic
+from types import MappingProxyType
 from typing import Literal
-from collections.abc import Callable
+from collections.abc import Callable, Mapping, Sequence
 
 from app.bots.runtime import BotRunner
 from app.engine.game import PokerEngine, SeatId, SEAT_ORDER, order_seats
@@ -13,14 +19,37 @@ from app.storage.hand_store import HandStore
 
 MatchStatus = Literal["waiting", "running", "paused", "stopped"]
 
+_ZERO_PNL = (0.0,) * len(SEAT_ORDER)
 
-@dataclass
+DEFAULT_HAND_INTERVAL_SECONDS = 1.0
+
+
+def _hand_interval_from_env() -> float:
+    """APP_HAND_INTERVAL_SECONDS, clamped at 0; malformed values fall back to the default."""
+    try:
+        interval = float(os.getenv("APP_HAND_INTERVAL_SECONDS", DEFAULT_HAND_INTERVAL_SECONDS))
+    except ValueError:
+        return DEFAULT_HAND_INTERVAL_SECONDS
+    if not math.isfinite(interval):
+        return DEFAULT_HAND_INTERVAL_SECONDS
+    return max(0.0, interval)
+
+
+@dataclass(slots=True)
 class SeatState:
     seat_id: SeatId
     ready: bool = False
     bot_name: str | None = None
     bot_id: str | None = None
     uploaded_at: datetime | None = None
+    uploaded_iso: str | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self.uploaded_iso = self.uploaded_at.isoformat() if self.uploaded_at else None
+
+    def mark_uploaded(self, uploaded_at: datetime) -> None:
+        self.uploaded_at = uploaded_at
+        self.uploaded_iso = uploaded_at.isoformat()
 
     def to_dict(self) -> dict:
         return {
@@ -28,33 +57,87 @@ class SeatState:
             "ready": self.ready,
             "bot_name": self.bot_name,
             "bot_id": self.bot_id,
-            "uploaded_at": self.uploaded_at.isoformat() if self.uploaded_at else None,
+            "uploaded_at": self.uploaded_iso,
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HandRecord:
     hand_id: str
+    hand_number: int
     completed_at: datetime
     summary: str
     winners: list[SeatId]
     pot: float
     history_path: str
     deltas: dict[SeatId, float]
-    active_seats: list[SeatId]
+    active_seats: Sequence[SeatId]
+    completed_iso: str = field(init=False)
+    _summary_dict: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        completed_iso = self.completed_at.isoformat()
+        object.__setattr__(self, "completed_iso", completed_iso)
+        object.__setattr__(
+            self,
+            "_summary_dict",
+            {
+                "hand_id": self.hand_id,
+                "completed_at": completed_iso,
+                "summary": self.summary,
+                "winners": self.winners,
+                "pot": self.pot,
+            },
+        )
 
     def to_summary_dict(self) -> dict:
-        return {
-            "hand_id": self.hand_id,
-            "completed_at": self.completed_at.isoformat(),
-            "summary": self.summary,
-            "winners": self.winners,
-            "pot": self.pot,
-        }
+        # Shared across requests; callers must treat it as read-only.
+        return self._summary_dict
+
+
+@dataclass(frozen=True, slots=True)
+class HandsView:
+    """Hand lists published together so readers can use them without the service lock.
+
+    The lists only grow until reset or trimming swaps in new ones, so a reader bound by ``count``
+    sees a consistent prefix.
+    """
+
+    hands: list[HandRecord]
+    hand_numbers: list[int]
+    pnl_entries: list[dict]
+    # Per-seat cumulative PnL (SEAT_ORDER) before each retained hand, and after the last one.
+    pnl_before: list[tuple[float, ...]]
+    pnl_running: tuple[float, ...]
+    count: int
+    # Hands trimmed from the front of the lists since the last reset.
+    dropped: int
+
+    @property
+    def hands_played(self) -> int:
+        return self.dropped + self.count
+
+
+_EMPTY_HANDS_VIEW = HandsView(
+    hands=[],
+    hand_numbers=[],
+    pnl_entries=[],
+    pnl_before=[],
+    pnl_running=_ZERO_PNL,
+    count=0,
+    dropped=0,
+)
 
 
 class MatchService:
-    HAND_INTERVAL_SECONDS = 1.0
+    # Target seconds between hand starts; 0 plays hands back to back.
+    HAND_INTERVAL_SECONDS = _hand_interval_from_env()
+    # How many intervals the loop may fall behind before it stops catching up.
+    MAX_CADENCE_LAG_INTERVALS = 3
+    # How long pause/end/reset wait for a detached loop to finish its hand before returning.
+    LOOP_JOIN_TIMEOUT_SECONDS = 2.0
+    # Hand records kept in memory; older hands drop out of the lists in batches of a quarter.
+    MAX_RETAINED_HANDS = 10_000
 
     def __init__(
         self,
@@ -67,32 +150,53 @@ class MatchService:
         self.hand_store = hand_store
         self.engine = engine or PokerEngine()
         self._on_hand_completed = on_hand_completed
-        self._lock = Lock()
+        # Reentrant so status transitions issued from the loop thread's callbacks cannot deadlock.
+        self._lock = RLock()
+        # Notified whenever the published hand view changes (new hand or reset).
+        self._hands_changed = Condition(self._lock)
+        # Each loop thread gets its own stop event; only the thread in _loop_thread may publish hands,
+        # so a loop that outlives pause/end/reset finishes its hand and exits without touching state.
         self._stop_event = Event()
         self._loop_thread: Thread | None = None
         self._status: MatchStatus = "waiting"
         self._started_at: datetime | None = None
         self._hands: list[HandRecord] = []
-        self._hand_counter = 0
+        self._hand_numbers: list[int] = []
+        # Parallel to _hands; entries are shared with callers and must not be mutated.
+        self._pnl_entries: list[dict] = []
+        # Per-seat cumulative PnL (SEAT_ORDER) before each retained hand, and after the last one;
+        # list_pnl returns these as the base a client adds the entries onto.
+        self._pnl_before: list[tuple[float, ...]] = []
+        self._pnl_running: tuple[float, ...] = _ZERO_PNL
+        self._dropped_hands = 0
+        self._generation = 0
+        self._hands_view = _EMPTY_HANDS_VIEW
+        # Running per-seat totals so the leaderboard survives trimming of old hands.
+        self._seat_hands: dict[SeatId, int] = dict.fromkeys(SEAT_ORDER, 0)
+        self._seat_total_bb: dict[SeatId, float] = dict.fromkeys(SEAT_ORDER, 0.0)
         self._button_seat: SeatId | None = None
         self._seats: dict[SeatId, SeatState] = {
             seat_id: SeatState(seat_id=seat_id) for seat_id in SEAT_ORDER
         }
         self._bots: dict[SeatId, BotRunner | None] = {seat_id: None for seat_id in SEAT_ORDER}
+        self._seats_dirty = True
+        self._ready_seats_cache: tuple[SeatId, ...] | None = None
+        self._seat_names_cache: Mapping[SeatId, str] = MappingProxyType({})
+        self._active_bots_cache: Mapping[SeatId, BotRunner | None] = MappingProxyType({})
+        # Read-mostly views republished on every mutation so polling readers skip the lock.
+        self._seats_snapshot: tuple[dict, ...] = ()
+        self._match_snapshot: dict = {}
+        with self._lock:
+            self._publish_hands_locked()
+            self._publish_seats_locked()
+            self._publish_match_locked()
 
     def get_seats(self) -> list[dict]:
-        with self._lock:
-            return [self._seats[seat_id].to_dict() for seat_id in SEAT_ORDER]
+        return list(self._seats_snapshot)
 
     def get_match(self) -> dict:
-        with self._lock:
-            return {
-                "table_id": self.table_id,
-                "status": self._status,
-                "started_at": self._started_at.isoformat() if self._started_at else None,
-                "hands_played": len(self._hands),
-                "last_hand_id": self._hands[-1].hand_id if self._hands else None,
-            }
+        # Shallow copy: the snapshot itself is shared by every reader.
+        return dict(self._match_snapshot)
 
     def list_hands(
         self,
@@ -101,47 +205,67 @@ class MatchService:
         page_size: int = 100,
         max_hand_id: int | None = None,
     ) -> list[dict]:
-        with self._lock:
-            total_hands = len(self._hands)
-            snapshot_count = total_hands if max_hand_id is None else min(max_hand_id, total_hands)
-            if limit is not None:
-                page_size = limit
-                page = 1
-            if page_size < 1 or snapshot_count == 0:
-                return []
-            start = max(snapshot_count - (page * page_size), 0)
-            end = snapshot_count - (page - 1) * page_size
-            if end <= 0 or start >= snapshot_count:
-                return []
-            page_records = self._hands[start:end]
-            return [record.to_summary_dict() for record in reversed(page_records)]
-
-    def list_pnl(self, since_hand_id: int | None = None) -> tuple[list[dict], int | None]:
-        with self._lock:
-            if not self._hands:
-                return [], None
-            entries: list[dict] = []
-            last_hand_id: int | None = None
-            for record in self._hands:
-                try:
-                    hand_number = int(record.hand_id)
-                except ValueError:
-                    continue
-                last_hand_id = hand_number
-                if since_hand_id is not None and hand_number <= since_hand_id:
-                    continue
-                entries.append({"hand_id": hand_number, "deltas": record.deltas})
-            return entries, last_hand_id
+        view = self._hands_view
+        hands, dropped = view.hands, view.dropped
+        total_hands = view.hands_played
+        snapshot_count = total_hands if max_hand_id is None else min(max_hand_id, total_hands)
+        if limit is not None:
+            page_size = limit
+            page = 1
+        if page_size < 1 or snapshot_count == 0:
+            return []
+        start = max(snapshot_count - (page * page_size), 0)
+        end = snapshot_count - (page - 1) * page_size
+        if end <= dropped or start >= snapshot_count:
+            return []
+        page_hands = hands[max(start - dropped, 0) : end - dropped]
+        return [record.to_summary_dict() for record in reversed(page_hands)]
+
+    def count_hands(self, max_hand_id: int | None = None) -> int:
+        """Retained hands numbered at most ``max_hand_id``; the pages list_hands can serve."""
+        view = self._hands_view
+        played = view.hands_played if max_hand_id is None else min(max_hand_id, view.hands_played)
+        # Hand numbers are contiguous, so everything past the trimmed prefix is still retained.
+        return max(played - view.dropped, 0)
+
+    def wait_for_hands(self, after: int = 0, timeout: float | None = None) -> bool:
+        """Block until more than ``after`` hands have been played; False on timeout."""
+        with self._hands_changed:
+            return self._hands_changed.wait_for(
+                lambda: self._hands_view.hands_played > after,
+                timeout=timeout,
+            )
+
+    def list_pnl(self, since_hand_id: int | None = None) -> dict:
+        """PnL entries after ``since_hand_id``, plus each seat's cumulative PnL before the first one.
+
+        Only the most recent hands are retained, so a client drawing the full series must start
+        from ``base`` rather than zero for its totals to match the leaderboard.
+        """
+        view = self._hands_view
+        total = view.count
+        start = 0 if since_hand_id is None else bisect_right(view.hand_numbers, since_hand_id, 0, total)
+        base = view.pnl_before[start] if start < total else view.pnl_running
+        return {
+            "base": dict(zip(SEAT_ORDER, base)),
+            "entries": view.pnl_entries[start:total],
+            "last_hand_id": view.hand_numbers[total - 1] if total else None,
+        }
 
     def get_hand(self, hand_id: str) -> dict | None:
-        with self._lock:
-            record = next((h for h in self._hands if h.hand_id == hand_id), None)
-            if not record:
-                return None
+        try:
+            hand_number = int(hand_id)
+        except ValueError:
+            return None
+        view = self._hands_view
+        index = bisect_left(view.hand_numbers, hand_number, 0, view.count)
+        if index == view.count or view.hands[index].hand_id != hand_id:
+            return None
+        record = view.hands[index]
         history_text = self.hand_store.load_hand(hand_id)
         return {
             "hand_id": record.hand_id,
-            "completed_at": record.completed_at.isoformat(),
+            "completed_at": record.completed_iso,
             "summary": record.summary,
             "winners": record.winners,
             "pot": record.pot,
@@ -169,7 +293,10 @@ class MatchService:
             seat.ready = True
             seat.bot_name = bot_name
             seat.bot_id = bot_id
-            seat.uploaded_at = now
+            seat.mark_uploaded(now)
+            self._seats_dirty = True
+            self._ready_seats_cache = None
+            self._publish_seats_locked()
 
             return seat.to_dict()
 
@@ -186,6 +313,7 @@ class MatchService:
             self._status = "running"
             if previous_status in {"waiting", "stopped"} or self._started_at is None:
                 self._started_at = now
+            self._publish_match_locked()
             self._ensure_loop_running_locked()
 
     def pause_match(self) -> None:
@@ -194,11 +322,10 @@ class MatchService:
             if self._status != "running":
                 raise RuntimeError("Match is not running")
             self._status = "paused"
-            self._stop_event.set()
-            thread = self._loop_thread
-            self._loop_thread = None
-        if thread and thread.is_alive() and thread is not current_thread():
-            thread.join(timeout=2)
+            self._publish_match_locked()
+            thread = self._detach_loop_locked()
+        self._join_loop_thread(thread)
+        self.hand_store.flush()
 
     def resume_match(self) -> None:
         with self._lock:
@@ -209,6 +336,7 @@ class MatchService:
             self._status = "running"
             if self._started_at is None:
                 self._started_at = datetime.now(timezone.utc)
+            self._publish_match_locked()
             self._ensure_loop_running_locked()
 
     def end_match(self) -> None:
@@ -217,81 +345,146 @@ class MatchService:
             if self._status not in {"running", "paused"}:
                 raise RuntimeError("Match is not running")
             self._status = "stopped"
-            self._stop_event.set()
-            thread = self._loop_thread
-            self._loop_thread = None
-        if thread and thread.is_alive() and thread is not current_thread():
-            thread.join(timeout=2)
+            self._publish_match_locked()
+            thread = self._detach_loop_locked()
+        self._join_loop_thread(thread)
+        self.hand_store.flush()
 
     def reset_match(self) -> None:
         thread: Thread | None
+        # One critical section, so a start_match cannot slip in and run a loop against the old seats.
         with self._lock:
             self._status = "waiting"
+            thread = self._detach_loop_locked()
             self._started_at = None
-            self._hands.clear()
-            self._hand_counter = 0
+            self._hands = []
+            self._hand_numbers = []
+            self._pnl_entries = []
+            self._pnl_before = []
+            self._pnl_running = _ZERO_PNL
+            self._dropped_hands = 0
+            self._generation += 1
+            self._seat_hands = dict.fromkeys(SEAT_ORDER, 0)
+            self._seat_total_bb = dict.fromkeys(SEAT_ORDER, 0.0)
+            self._publish_hands_locked()
             self._button_seat = None
-            self._seats = {
-                seat_id: SeatState(seat_id=seat_id) for seat_id in SEAT_ORDER
-            }
+            self._seats = {seat_id: SeatState(seat_id=seat_id) for seat_id in SEAT_ORDER}
             self._bots = {seat_id: None for seat_id in SEAT_ORDER}
-            self._stop_event.set()
-            thread = self._loop_thread
-            self._loop_thread = None
-
-        if thread and thread.is_alive() and thread is not current_thread():
-            thread.join(timeout=2)
+            self._seats_dirty = True
+            self._ready_seats_cache = None
+            self._publish_seats_locked()
+            self._publish_match_locked()
 
+        self._join_loop_thread(thread)
         self.hand_store.clear()
 
+    def close(self) -> None:
+        """Stop the match loop and release the hand store's file and flusher thread."""
+        with self._lock:
+            thread = self._detach_loop_locked()
+        self._join_loop_thread(thread)
+        self.hand_store.close()
+
     def _ensure_loop_running_locked(self) -> None:
         if self._loop_thread and self._loop_thread.is_alive():
             return
-        self._stop_event.clear()
+        stop_event = Event()
+        self._stop_event = stop_event
         self._loop_thread = Thread(
             target=self._run_match_loop,
+            args=(stop_event,),
             daemon=True,
             name=f"match-loop-{self.table_id}",
         )
         self._loop_thread.start()
 
-    def _run_match_loop(self) -> None:
-        while not self._stop_event.is_set():
+    def _detach_loop_locked(self) -> Thread | None:
+        """Stop the current loop thread and give up ownership; the caller joins it outside the lock."""
+        self._stop_event.set()
+        thread = self._loop_thread
+        self._loop_thread = None
+        return thread
+
+    def _join_loop_thread(self, thread: Thread | None) -> None:
+        # Bounded: a hand in play can outlast this, but a detached loop never publishes again.
+        if thread and thread.is_alive() and thread is not current_thread():
+            thread.join(timeout=self.LOOP_JOIN_TIMEOUT_SECONDS)
+
+    def _owns_loop_locked(self) -> bool:
+        return self._loop_thread is current_thread()
+
+    def _run_match_loop(self, stop_event: Event) -> None:
+        next_deadline = monotonic()
+        while True:
             try:
                 with self._lock:
+                    if stop_event.is_set() or not self._owns_loop_locked():
+                        return
                     if self._status != "running":
+                        # Released in the same critical section as the status check, so a
+                        # start_match that sees this thread alive cannot be left without a loop.
+                        self._loop_thread = None
                         return
-                    self._simulate_hand_locked()
+                self._simulate_hand(from_loop=True)
             except Exception:  # noqa: BLE001 - runtime safeguard for untrusted bot failures
                 with self._lock:
-                    self._status = "waiting"
-                    self._started_at = None
-                self._stop_event.set()
+                    if self._owns_loop_locked():
+                        self._status = "waiting"
+                        self._started_at = None
+                        self._loop_thread = None
+                        self._publish_match_locked()
+                stop_event.set()
                 return
-            self._stop_event.wait(self.HAND_INTERVAL_SECONDS)
-
-    def _simulate_hand_locked(self) -> None:
-        self._hand_counter += 1
-        hand_id = str(self._hand_counter)
-        active_seats = self._ready_seats_locked()
-        if len(active_seats) < 2:
-            self._status = "waiting"
-            self._started_at = None
-            return
-
-        button = self._next_button_seat(active_seats)
-        self._button_seat = button
-
-        seat_names = {
-            seat_id: self._seats[seat_id].bot_name or f"Seat{seat_id}-Bot"
-            for seat_id in active_seats
-        }
-        bots = {
-            seat_id: bot for seat_id, bot in self._bots.items() if seat_id in active_seats
-        }
-        if any(bot is None for bot in bots.values()):
-            raise RuntimeError("match loop started without loaded bots")
+            interval = self.HAND_INTERVAL_SECONDS
+            if interval <= 0:
+                continue
+            next_deadline += interval
+            remaining = next_deadline - monotonic()
+            if remaining > 0:
+                stop_event.wait(remaining)
+            elif remaining < -self.MAX_CADENCE_LAG_INTERVALS * interval:
+                next_deadline = monotonic()
+
+    def _simulate_hand(self, from_loop: bool = False) -> None:
+        with self._lock:
+            if from_loop and not self._owns_loop_locked():
+                return
+            active_seats = self._ready_seats_locked()
+            if len(active_seats) < 2:
+                self._status = "waiting"
+                self._started_at = None
+                self._publish_match_locked()
+                return
+            # Only the owning loop appends, so the next number is always one past the last hand.
+            hand_number = self._dropped_hands + len(self._hands) + 1
+            # A hand that finishes after reset_match has bumped the generation is discarded.
+            generation = self._generation
+            button = self._next_button_seat(active_seats)
+            self._button_seat = button
+
+            if self._seats_dirty:
+                self._seat_names_cache = MappingProxyType(
+                    {
+                        seat_id: self._seats[seat_id].bot_name or f"Seat{seat_id}-Bot"
+                        for seat_id in active_seats
+                    }
+                )
+                self._active_bots_cache = MappingProxyType(
+                    {seat_id: bot for seat_id, bot in self._bots.items() if seat_id in active_seats}
+                )
+                self._seats_dirty = False
+            seat_names = self._seat_names_cache
+            bots = self._active_bots_cache
+            if any(bot is None for bot in bots.values()):
+                raise RuntimeError("match loop started without loaded bots")
+            seat_bot_ids = {
+                seat_id: self._seats[seat_id].bot_id
+                for seat_id in active_seats
+                if self._seats[seat_id].bot_id is not None
+            }
 
+        hand_id = str(hand_number)
+        completed_at = datetime.now(timezone.utc)
         result = self.engine.play_hand(
             hand_id=hand_id,
             bots=bots,
@@ -310,8 +503,8 @@ class MatchService:
             actions=result.actions,
             small_blind_cents=self.engine.small_blind_cents,
             big_blind_cents=self.engine.big_blind_cents,
+            played_at=completed_at,
         )
-        history_path = self.hand_store.save_hand(hand_id, history)
 
         pot_size = result.pot_cents / 100
         winners_label = ", ".join(f"Seat {seat}" for seat in result.winners)
@@ -324,27 +517,83 @@ class MatchService:
             deltas[seat_id] = delta_cents / 100
         hand_record = HandRecord(
             hand_id=hand_id,
-            completed_at=datetime.now(timezone.utc),
+            hand_number=hand_number,
+            completed_at=completed_at,
             summary=summary,
             winners=result.winners,
             pot=pot_size,
-            history_path=str(history_path),
+            history_path=self.hand_store.path_for(hand_id),
             deltas=deltas,
             active_seats=active_seats,
         )
-        self._hands.append(hand_record)
+        with self._lock:
+            # A loop detached by pause/end/reset while this hand was in play drops it, history
+            # included, so it cannot overwrite the hand its successor plays under the same number.
+            if self._generation != generation or (from_loop and not self._owns_loop_locked()):
+                return
+            self.hand_store.save_hand(hand_id, history)
+            if not self._append_hand_locked(hand_record):
+                return
         if self._on_hand_completed is not None:
-            seat_bot_ids = {
-                seat_id: self._seats[seat_id].bot_id
-                for seat_id in active_seats
-                if self._seats[seat_id].bot_id is not None
-            }
             try:
                 self._on_hand_completed(hand_record, seat_bot_ids)
             except Exception:
                 # Persistence failures should not crash the match loop.
                 pass
 
+    def _append_hand_locked(self, record: HandRecord) -> bool:
+        """Publish a finished hand; False if it is not newer than the last retained hand."""
+        if self._hand_numbers and record.hand_number <= self._hand_numbers[-1]:
+            return False
+        self._hands.append(record)
+        self._hand_numbers.append(record.hand_number)
+        self._pnl_entries.append({"hand_id": record.hand_number, "deltas": record.deltas})
+        self._pnl_before.append(self._pnl_running)
+        self._pnl_running = tuple(
+            total + record.deltas.get(seat_id, 0.0) for seat_id, total in zip(SEAT_ORDER, self._pnl_running)
+        )
+        for seat_id in record.active_seats:
+            self._seat_hands[seat_id] += 1
+        big_blind = self.engine.big_blind_cents / 100
+        if big_blind:
+            for seat_id, delta in record.deltas.items():
+                self._seat_total_bb[seat_id] += delta / big_blind
+        limit = self.MAX_RETAINED_HANDS
+        if len(self._hands) > limit + limit // 4:
+            drop = len(self._hands) - limit
+            self._hands = self._hands[drop:]
+            self._hand_numbers = self._hand_numbers[drop:]
+            self._pnl_entries = self._pnl_entries[drop:]
+            self._pnl_before = self._pnl_before[drop:]
+            self._dropped_hands += drop
+        self._publish_hands_locked()
+        self._publish_match_locked()
+        return True
+
+    def _publish_hands_locked(self) -> None:
+        self._hands_view = HandsView(
+            hands=self._hands,
+            hand_numbers=self._hand_numbers,
+            pnl_entries=self._pnl_entries,
+            pnl_before=self._pnl_before,
+            pnl_running=self._pnl_running,
+            count=len(self._hands),
+            dropped=self._dropped_hands,
+        )
+        self._hands_changed.notify_all()
+
+    def _publish_seats_locked(self) -> None:
+        self._seats_snapshot = tuple(self._seats[seat_id].to_dict() for seat_id in SEAT_ORDER)
+
+    def _publish_match_locked(self) -> None:
+        self._match_snapshot = {
+            "table_id": self.table_id,
+            "status": self._status,
+            "started_at": self._started_at.isoformat() if self._started_at else None,
+            "hands_played": self._dropped_hands + len(self._hands),
+            "last_hand_id": self._hands[-1].hand_id if self._hands else None,
+        }
+
     def get_leaderboard(self) -> dict:
         with self._lock:
             big_blind = self.engine.big_blind_cents / 100
@@ -352,18 +601,12 @@ class MatchService:
                 seat_id: {
                     "seat_id": seat_id,
                     "bot_name": self._seats[seat_id].bot_name,
-                    "hands_played": 0,
-                    "total_bb": 0.0,
+                    "hands_played": self._seat_hands[seat_id],
+                    "total_bb": self._seat_total_bb[seat_id],
                     "bb_per_hand": 0.0,
                 }
                 for seat_id in SEAT_ORDER
             }
-            for record in self._hands:
-                for seat_id in record.active_seats:
-                    stats[seat_id]["hands_played"] += 1
-                for seat_id, delta in record.deltas.items():
-                    if big_blind:
-                        stats[seat_id]["total_bb"] += delta / big_blind
             leaders = [
                 stat
                 for stat in stats.values()
@@ -372,21 +615,20 @@ class MatchService:
             for stat in leaders:
                 hands = stat["hands_played"]
                 stat["bb_per_hand"] = stat["total_bb"] / hands if hands else 0.0
-            leaders.sort(
-                key=lambda item: (item["bb_per_hand"], item["hands_played"]),
-                reverse=True,
-            )
+            leaders.sort(key=itemgetter("bb_per_hand", "hands_played"), reverse=True)
             return {"leaders": leaders, "big_blind": big_blind}
 
-    def _ready_seats_locked(self) -> list[SeatId]:
-        ready = [
-            seat_id
-            for seat_id, seat in self._seats.items()
-            if seat.ready and self._bots[seat_id] is not None
-        ]
-        return order_seats(ready)
+    def _ready_seats_locked(self) -> tuple[SeatId, ...]:
+        if self._ready_seats_cache is None:
+            ready = [
+                seat_id
+                for seat_id, seat in self._seats.items()
+                if seat.ready and self._bots[seat_id] is not None
+            ]
+            self._ready_seats_cache = tuple(order_seats(ready))
+        return self._ready_seats_cache
 
-    def _next_button_seat(self, active_seats: list[SeatId]) -> SeatId:
+    def _next_button_seat(self, active_seats: Sequence[SeatId]) -> SeatId:
         if self._button_seat not in active_seats:
             return active_seats[0]
         index = active_seats.index(self._button_seat)
@@ -57,6 +57,14 @@ class TableRuntimeManager:
         with self._lock:
             return self._services.get(table_id)
 
+    def close(self) -> None:
+        """Stop every loaded table's match loop and close its hand store."""
+        with self._lock:
+            services = list(self._services.values())
+            self._services.clear()
+        for service in services:
+            service.close()
+
 
 def _blind_to_cents(value: float) -> int:
     return int(round(value * 100))
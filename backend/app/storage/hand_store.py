@@ -1,25 +1,193 @@
+import os
+import struct
+from collections import OrderedDict
+from collections.abc import Iterable
 from pathlib import Path
+from queue import Empty, Queue
+from threading import Lock, Thread
+
+# Each log record is: hand_id length, content length, hand_id bytes, content bytes.
+_RECORD_HEADER = struct.Struct(">HI")
 
 
 class HandStore:
+    # Most hands a single flusher pass writes before re-checking the queue.
+    FLUSH_BATCH_SIZE = 64
+    LOG_FILENAME = "hands.log"
+    # The previous run's log, kept for inspection; hand numbering restarts with every run.
+    PREVIOUS_LOG_FILENAME = "hands.log.1"
+    # Decoded histories kept for repeat reads of the same hand from the viewer.
+    CACHE_SIZE = 512
+    # How often flush() re-checks that the flusher thread is still alive while it waits.
+    FLUSH_POLL_SECONDS = 0.5
+
     def __init__(self, base_dir: Path | None = None) -> None:
         if base_dir is None:
             repo_root = Path(__file__).resolve().parents[3]
             base_dir = repo_root / "runtime" / "hands"
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.base_dir / self.LOG_FILENAME
+        # Histories accepted by save_hand but not yet in the log, already UTF-8 encoded so the
+        # flusher cannot fail on them; load_hand serves them from here.
+        self._lock = Lock()
+        self._write_lock = Lock()
+        self._pending: dict[str, bytes] = {}
+        self._index: dict[str, tuple[int, int]] = {}
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        # Hands from an earlier run can never be served again, so start a fresh log rather than
+        # reading and indexing the old one.
+        if self.log_path.exists():
+            os.replace(self.log_path, self.base_dir / self.PREVIOUS_LOG_FILENAME)
+        self._raw = open(self.log_path, "a+b", buffering=0)
+        self._size = 0
+        # Hands whose last write failed; the flusher retries them ahead of its next batch.
+        self._unwritten: list[str] = []
+        # Set when a failed write may have left partial bytes past _size.
+        self._dirty_tail = False
+        self._closed = False
+        # None is the shutdown sentinel posted by close().
+        self._queue: Queue[str | None] = Queue()
+        self._flusher = Thread(target=self._flush_loop, daemon=True, name="hand-store-flusher")
+        self._flusher.start()
+
+    def path_for(self, hand_id: str) -> str:
+        return f"{self.log_path}#{hand_id}"
 
-    def save_hand(self, hand_id: str, content: str) -> Path:
-        path = self.base_dir / f"{hand_id}.txt"
-        path.write_text(content, encoding="utf-8")
-        return path
+    def save_hand(self, hand_id: str, content: str) -> str:
+        # Encoded here so text the log cannot hold is rejected to the caller, not the flusher.
+        encoded = content.encode("utf-8")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Hand store is closed")
+            self._pending[hand_id] = encoded
+            self._cache.pop(hand_id, None)
+            # Enqueued under the lock so nothing can land behind close()'s sentinel.
+            self._queue.put(hand_id)
+        return self.path_for(hand_id)
 
     def load_hand(self, hand_id: str) -> str | None:
-        path = self.base_dir / f"{hand_id}.txt"
-        if not path.exists():
+        with self._lock:
+            pending = self._pending.get(hand_id)
+            content = self._cache.get(hand_id)
+            if pending is None and content is not None:
+                self._cache.move_to_end(hand_id)
+            location = self._index.get(hand_id)
+        if pending is not None:
+            return pending.decode("utf-8")
+        if content is not None:
+            return content
+        if location is None:
             return None
-        return path.read_text(encoding="utf-8")
+        offset, length = location
+        content = os.pread(self._raw.fileno(), length, offset).decode("utf-8")
+        with self._lock:
+            if self._index.get(hand_id) == location:
+                self._cache[hand_id] = content
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return content
+
+    def flush(self) -> None:
+        """Block until every hand saved so far has been through the flusher.
+
+        Returns early if the flusher thread has died; unwritten hands stay readable from memory.
+        """
+        queue = self._queue
+        with queue.all_tasks_done:
+            while queue.unfinished_tasks and self._flusher.is_alive():
+                queue.all_tasks_done.wait(self.FLUSH_POLL_SECONDS)
 
     def clear(self) -> None:
-        for path in self.base_dir.glob("*.txt"):
-            path.unlink(missing_ok=True)
+        self.flush()
+        with self._write_lock, self._lock:
+            self._raw.truncate(0)
+            self._pending.clear()
+            self._unwritten.clear()
+            self._index.clear()
+            self._cache.clear()
+            self._size = 0
+            self._dirty_tail = False
+
+    def close(self) -> None:
+        """Write out queued hands, stop the flusher thread and close the log file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._flusher.join()
+        self._raw.close()
+
+    def _write_all(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[self._raw.write(view) :]
+
+    def _flush_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < self.FLUSH_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            try:
+                self._write_batch([hand_id for hand_id in batch if hand_id is not None])
+            except Exception:  # noqa: BLE001 - the flusher must outlive any one batch
+                # _write_batch has already kept the batch pending for retry where it could.
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _write_batch(self, hand_ids: list[str]) -> None:
+        with self._write_lock:
+            hand_ids = list(dict.fromkeys([*self._unwritten, *hand_ids]))
+            with self._lock:
+                contents = [(hand_id, self._pending.get(hand_id)) for hand_id in hand_ids]
+            contents = [(hand_id, content) for hand_id, content in contents if content is not None]
+            if not contents:
+                return
+            try:
+                data, written, end = _encode_records(contents, self._size)
+                if self._dirty_tail:
+                    self._raw.truncate(self._size)
+                    self._dirty_tail = False
+                self._write_all(data)
+            except Exception:
+                # Part of the batch may have reached the file; cut it back to the last indexed
+                # record before the next write so offsets stay in step with _size. The hands stay
+                # pending, so they remain readable, and are retried with the next batch.
+                self._dirty_tail = True
+                self._unwritten = [hand_id for hand_id, _ in contents]
+                return
+            self._unwritten = []
+            self._size = end
+        with self._lock:
+            self._index.update(written)
+            for hand_id in written:
+                self._cache.pop(hand_id, None)
+            for hand_id, content in contents:
+                if self._pending.get(hand_id) is content:
+                    del self._pending[hand_id]
+
+
+def _encode_records(
+    contents: Iterable[tuple[str, bytes]],
+    offset: int,
+) -> tuple[bytes, dict[str, tuple[int, int]], int]:
+    """Serialise log records starting at ``offset``; returns the bytes, their index entries and the end offset."""
+    chunks: list[bytes] = []
+    written: dict[str, tuple[int, int]] = {}
+    for hand_id, encoded in contents:
+        encoded_id = hand_id.encode("utf-8")
+        chunks.append(_RECORD_HEADER.pack(len(encoded_id), len(encoded)))
+        chunks.append(encoded_id)
+        chunks.append(encoded)
+        content_offset = offset + _RECORD_HEADER.size + len(encoded_id)
+        written[hand_id] = (content_offset, len(encoded))
+        offset = content_offset + len(encoded)
+    return b"".join(chunks), written, offset
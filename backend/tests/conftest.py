@@ -1,8 +1,154 @@
 from __future__ import annotations
 
+import atexit
+import os
+import shutil
+import sqlite3
 import sys
+import tempfile
+from contextlib import closing
 from pathlib import Path
 
+import pytest
+
 backend_dir = Path(__file__).resolve().parents[1]
 if str(backend_dir) not in sys.path:
     sys.path.append(str(backend_dir))
+
+# app.api.routes creates its uploads, hands and auth database at import time. Point it at a
+# private directory so runs never touch the repo's runtime/ and xdist workers never share it.
+if "APP_RUNTIME_DIR" not in os.environ:
+    _runtime_dir = tempfile.mkdtemp(
+        prefix=f"ppg-test-runtime-{os.environ.get('PYTEST_XDIST_WORKER', 'main')}-"
+    )
+    atexit.register(shutil.rmtree, _runtime_dir, ignore_errors=True)
+    os.environ["APP_RUNTIME_DIR"] = _runtime_dir
+
+from app.api import routes  # noqa: E402
+from app.auth.config import AuthSettings  # noqa: E402
+from app.auth.service import AuthService  # noqa: E402
+from app.auth.store import AuthStore  # noqa: E402
+from app.services.match_service import MatchService  # noqa: E402
+from app.services.table_runtime_manager import TableRuntimeManager  # noqa: E402
+from app.storage.hand_store import HandStore  # noqa: E402
+
+# Users the route tests sign in as; ensure_user finds them instead of hashing a password.
+TEMPLATE_USERNAMES = ("alice", "bob")
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    """The app runs on asyncio under uvicorn; a second backend doubles anyio tests for no coverage."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def auth_db_template(tmp_path_factory) -> Path:
+    """Auth database with the bootstrap and template users already hashed, built once per session."""
+    db_path = tmp_path_factory.mktemp("auth-template") / "auth.sqlite3"
+    settings = AuthSettings(
+        session_cookie_name="ppg_session",
+        session_cookie_secure=None,
+        session_ttl_seconds=3600,
+        login_max_failures=3,
+        login_lockout_seconds=60,
+        login_failure_window_seconds=300,
+        bootstrap_username="bootstrap",
+        bootstrap_password="bootstrap-password",
+        db_path=db_path,
+        password_hash_low_cost=True,
+    )
+    auth_service = AuthService(store=AuthStore(db_path), settings=settings)
+    for username in TEMPLATE_USERNAMES:
+        auth_service.ensure_user(username, "correct-horse-battery-staple")
+    return db_path
+
+
+@pytest.fixture
+def auth_db_path(auth_db_template: Path, tmp_path: Path) -> Path:
+    """Per-test copy of the template database, so password hashing runs once per session."""
+    db_path = tmp_path / "auth.sqlite3"
+    with closing(sqlite3.connect(auth_db_template)) as source, closing(sqlite3.connect(db_path)) as target:
+        source.backup(target)
+    return db_path
+
+
+@pytest.fixture
+def open_hand_store(tmp_path: Path):
+    """Opens hand stores under tmp_path and closes them, flusher threads included, at teardown."""
+    stores: list[HandStore] = []
+
+    def open_store() -> HandStore:
+        store = HandStore(base_dir=tmp_path / "hands")
+        stores.append(store)
+        return store
+
+    yield open_store
+    for store in stores:
+        store.close()
+
+
+@pytest.fixture
+def hand_store(open_hand_store) -> HandStore:
+    return open_hand_store()
+
+
+def build_runtime_callback(table_id: str, small_blind: float, big_blind: float):
+    del table_id
+    del small_blind
+    return lambda hand, seat_bot_ids: routes._update_persistent_leaderboard(
+        hand,
+        seat_bot_ids,
+        big_blind=big_blind,
+    )
+
+
+@pytest.fixture
+def isolate_route_state(tmp_path, monkeypatch, auth_db_path):
+    """Point the routes module at per-test uploads, hands, match services and auth database."""
+    uploads_dir = tmp_path / "uploads"
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    hands_root = tmp_path / "hands"
+    service = MatchService(
+        table_id="default",
+        hand_store=HandStore(base_dir=hands_root / "default"),
+        on_hand_completed=build_runtime_callback("default", 0.5, 1.0),
+    )
+    # Route tests only need hands to exist, not a realistic cadence.
+    service.HAND_INTERVAL_SECONDS = 0
+    table_runtime_manager = TableRuntimeManager(
+        hands_root=hands_root,
+        on_hand_completed_factory=build_runtime_callback,
+    )
+    settings = AuthSettings(
+        session_cookie_name="ppg_session",
+        session_cookie_secure=None,
+        session_ttl_seconds=3600,
+        login_max_failures=3,
+        login_lockout_seconds=60,
+        login_failure_window_seconds=300,
+        bootstrap_username="bootstrap",
+        bootstrap_password="bootstrap-password",
+        db_path=auth_db_path,
+        password_hash_low_cost=True,
+    )
+    auth_service = AuthService(store=AuthStore(settings.db_path), settings=settings)
+
+    monkeypatch.setattr(routes, "uploads_dir", uploads_dir)
+    monkeypatch.setattr(routes, "match_service", service)
+    monkeypatch.setattr(routes, "table_runtime_manager", table_runtime_manager)
+    monkeypatch.setattr(routes, "auth_settings", settings)
+    monkeypatch.setattr(routes, "auth_service", auth_service)
+    yield
+    service.close()
+    table_runtime_manager.close()
+
+
+@pytest.fixture
+def alice(isolate_route_state) -> dict:
+    return routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
+
+
+@pytest.fixture
+def bob(isolate_route_state) -> dict:
+    return routes.auth_service.ensure_user("bob", "correct-horse-battery-staple")
@@ -0,0 +1,160 @@
+"""Request, cookie, bot-archive and hand-record helpers shared by the test modules."""
+
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.api import routes
+from app.services.match_service import HandRecord
+
+
+# Stored hands and leaderboard rows only need a plausible timestamp, not the current one.
+FIXED_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FIXED_TS = int(FIXED_NOW.timestamp())
+
+# Seats that sat out a hand still get a zero delta; make_hand copies this per record.
+EMPTY_DELTAS = MappingProxyType({str(seat_id): 0.0 for seat_id in range(1, 7)})
+
+
+def make_hand(hand_number: int, *, winner: str, loser: str, amount: float) -> HandRecord:
+    """Heads-up hand where the winner takes amount from the loser."""
+    return HandRecord(
+        hand_id=str(hand_number),
+        hand_number=hand_number,
+        completed_at=FIXED_NOW,
+        summary=f"Hand #{hand_number}",
+        winners=[winner],
+        pot=amount,
+        history_path=f"{hand_number}.txt",
+        deltas={**EMPTY_DELTAS, winner: amount, loser: -amount},
+        active_seats=sorted((winner, loser)),
+    )
+
+
+class FakeUploadFile:
+    def __init__(self, filename: str, payload: bytes):
+        self.filename = filename
+        self._payload = payload
+
+    async def read(self) -> bytes:
+        # Like UploadFile, the first read consumes the stream; a second read would return b"".
+        payload, self._payload = self._payload, b""
+        return payload
+
+
+def build_upload_file(filename: str, payload: bytes) -> FakeUploadFile:
+    return FakeUploadFile(filename=filename, payload=payload)
+
+
+def build_zip(files: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def build_stdio_zip(
+    script: str,
+    *,
+    command: list[str] | None = None,
+    manifest_path: str = "bot.json",
+    script_path: str = "bot.py",
+) -> bytes:
+    return build_zip(
+        {
+            manifest_path: json.dumps(
+                {
+                    "command": command or ["python", "bot.py"],
+                    "protocol_version": "2.0",
+                }
+            ),
+            script_path: script,
+        }
+    )
+
+
+# Built once at import; uploads never mutate the payload bytes.
+CHECK_BOT_ZIP = build_stdio_zip(
+    """
+import json
+import sys
+
+json.load(sys.stdin)
+json.dump({"action": "check"}, sys.stdout)
+"""
+)
+
+
+_BASE_SCOPE = MappingProxyType(
+    {
+        "type": "http",
+        "asgi.version": "3.0",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "query_string": b"",
+    }
+)
+_LOCALHOST_HEADER = (b"host", b"localhost")
+
+
+def _build_headers(
+    cookies: dict[str, str] | None,
+    host: str = "localhost",
+    extra_headers: list[tuple[bytes, bytes]] | None = None,
+) -> list[tuple[bytes, bytes]]:
+    headers: list[tuple[bytes, bytes]] = [
+        _LOCALHOST_HEADER if host == "localhost" else (b"host", host.encode("utf-8"))
+    ]
+    if cookies:
+        cookie_header = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        headers.append((b"cookie", cookie_header.encode("utf-8")))
+    if extra_headers:
+        headers.extend(extra_headers)
+    return headers
+
+
+def build_request_with_cookies(
+    cookies: dict[str, str] | None = None,
+    host: str = "localhost",
+    scheme: str = "http",
+    extra_headers: list[tuple[bytes, bytes]] | None = None,
+) -> Request:
+    return Request({**_BASE_SCOPE, "scheme": scheme, "headers": _build_headers(cookies, host, extra_headers)})
+
+
+def build_page_request(path: str, cookies: dict[str, str] | None = None) -> Request:
+    return Request(
+        {
+            **_BASE_SCOPE,
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "headers": _build_headers(cookies),
+        }
+    )
+
+
+def parse_set_cookie(response: Response) -> tuple[str, str, dict[str, str]]:
+    """Split the Set-Cookie header into name, value and lower-cased attributes."""
+    name_value, *attributes = response.headers["set-cookie"].split(";")
+    name, _, value = name_value.strip().partition("=")
+    parsed: dict[str, str] = {}
+    for attribute in attributes:
+        key, _, attribute_value = attribute.strip().partition("=")
+        parsed[key.lower()] = attribute_value
+    return name, value, parsed
+
+
+def extract_session_cookie(response: Response) -> str:
+    name, value, _ = parse_set_cookie(response)
+    assert name == routes.auth_settings.session_cookie_name
+    return value
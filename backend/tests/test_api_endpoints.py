@@ -1,200 +1,132 @@
-import io
-import json
 import math
 import stat
-import time
-import zipfile
-from datetime import datetime, timezone
-from http.cookies import SimpleCookie
-from pathlib import Path
+import threading
+from datetime import datetime
 
+import anyio
 import pytest
 from fastapi import HTTPException, Response
-from starlette.requests import Request
 
 from app.api import routes
-from app.services.match_service import HandRecord, MatchService
-from app.services.table_runtime_manager import TableRuntimeManager
 from app.auth.config import AuthSettings
+from app.auth.security import PasswordHasher
 from app.auth.service import AuthError, AuthLockedError
 from app.auth.service import AuthService
 from app.auth.store import AuthStore
-from app.storage.hand_store import HandStore
-
-
-class FakeUploadFile:
-    def __init__(self, filename: str, payload: bytes):
-        self.filename = filename
-        self._payload = payload
-
-    async def read(self) -> bytes:
-        return self._payload
+from support import (
+    CHECK_BOT_ZIP,
+    EMPTY_DELTAS,
+    FIXED_TS,
+    build_request_with_cookies,
+    build_stdio_zip,
+    build_upload_file,
+    build_zip,
+    extract_session_cookie,
+    make_hand,
+    parse_set_cookie,
+)
+
+pytestmark = pytest.mark.usefixtures("isolate_route_state")
+
+
+HELLO_BOT_ZIP = build_stdio_zip("print('hello')\n")
+# Over MAX_ARCHIVE_MEMBERS.
+TOO_MANY_FILES_ZIP = build_zip(
+    {
+        **{f"file_{i}.txt": "x" for i in range(130)},
+        "bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}',
+        "bot.py": "print('hello')\n",
+    }
+)
 
 
-def build_zip(files: dict[str, str]) -> bytes:
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for name, content in files.items():
-            archive.writestr(name, content)
-    return buffer.getvalue()
+def extract_cookie_attributes(response: Response) -> dict[str, str]:
+    name, _, attributes = parse_set_cookie(response)
+    assert name == routes.auth_settings.session_cookie_name
+    return attributes
 
 
-def build_stdio_zip(
-    script: str,
-    *,
-    command: list[str] | None = None,
-    manifest_path: str = "bot.json",
-    script_path: str = "bot.py",
-) -> bytes:
-    return build_zip(
-        {
-            manifest_path: json.dumps(
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("seat_id", "filename", "payload", "detail"),
+    [
+        pytest.param("7", "bot.zip", HELLO_BOT_ZIP, "seat_id must be 1-6", id="invalid-seat"),
+        pytest.param("1", "bot.txt", b"not a zip", "Only .zip bot uploads are supported", id="non-zip"),
+        pytest.param("1", "bot.zip", b"", "Upload payload is empty", id="empty-payload"),
+        pytest.param(
+            "1",
+            "bot.zip",
+            build_zip({"readme.txt": "no bot here"}),
+            "bot.json must exist at zip root or one top-level folder",
+            id="missing-bot-file",
+        ),
+        pytest.param(
+            "1", "bot.zip", b"not-a-real-zip", "Upload is not a valid zip archive", id="invalid-zip-archive"
+        ),
+        pytest.param(
+            "1",
+            "bot.zip",
+            build_zip({"../bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}'}),
+            "Archive contains unsafe paths",
+            id="unsafe-archive-paths",
+        ),
+        pytest.param(
+            "1",
+            "bot.zip",
+            build_zip(
                 {
-                    "command": command or ["python", "bot.py"],
-                    "protocol_version": "2.0",
+                    "bot_a/bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}',
+                    "bot_b/bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}',
                 }
             ),
-            script_path: script,
-        }
-    )
-
-
-def build_upload_file(filename: str, payload: bytes) -> FakeUploadFile:
-    return FakeUploadFile(filename=filename, payload=payload)
-
-
-def build_runtime_callback(table_id: str, small_blind: float, big_blind: float):
-    del table_id
-    del small_blind
-    return lambda hand, seat_bot_ids: routes._update_persistent_leaderboard(
-        hand,
-        seat_bot_ids,
-        big_blind=big_blind,
-    )
-
-
-@pytest.fixture(autouse=True)
-def isolate_route_state(tmp_path, monkeypatch):
-    uploads_dir = tmp_path / "uploads"
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-    hands_root = tmp_path / "hands"
-    service = MatchService(
-        table_id="default",
-        hand_store=HandStore(base_dir=hands_root / "default"),
-        on_hand_completed=build_runtime_callback("default", 0.5, 1.0),
-    )
-    service.HAND_INTERVAL_SECONDS = 0.01
-    table_runtime_manager = TableRuntimeManager(
-        hands_root=hands_root,
-        on_hand_completed_factory=build_runtime_callback,
-    )
-    settings = AuthSettings(
-        session_cookie_name="ppg_session",
-        session_cookie_secure=None,
-        session_ttl_seconds=3600,
-        login_max_failures=3,
-        login_lockout_seconds=60,
-        login_failure_window_seconds=300,
-        bootstrap_username="bootstrap",
-        bootstrap_password="bootstrap-password",
-        db_path=Path(tmp_path / "auth.sqlite3"),
-    )
-    auth_service = AuthService(store=AuthStore(settings.db_path), settings=settings)
-    auth_service.ensure_user("alice", "correct-horse-battery-staple")
-
-    monkeypatch.setattr(routes, "uploads_dir", uploads_dir)
-    monkeypatch.setattr(routes, "match_service", service)
-    monkeypatch.setattr(routes, "table_runtime_manager", table_runtime_manager)
-    monkeypatch.setattr(routes, "auth_settings", settings)
-    monkeypatch.setattr(routes, "auth_service", auth_service)
-    yield
-    service.reset_match()
-    for table_service in table_runtime_manager._services.values():
-        table_service.reset_match()
-
-
-def build_request_with_cookies(
-    cookies: dict[str, str] | None = None,
-    host: str = "localhost",
-    scheme: str = "http",
-    extra_headers: list[tuple[bytes, bytes]] | None = None,
-) -> Request:
-    headers: list[tuple[bytes, bytes]] = []
-    headers.append((b"host", host.encode("utf-8")))
-    if cookies:
-        cookie_header = "; ".join(f"{k}={v}" for k, v in cookies.items())
-        headers.append((b"cookie", cookie_header.encode("utf-8")))
-    if extra_headers:
-        headers.extend(extra_headers)
-    scope = {
-        "type": "http",
-        "asgi.version": "3.0",
-        "scheme": scheme,
-        "method": "GET",
-        "path": "/",
-        "raw_path": b"/",
-        "query_string": b"",
-        "headers": headers,
-    }
-    return Request(scope)
-
-
-def extract_session_cookie(response: Response) -> str:
-    cookie = SimpleCookie()
-    cookie.load(response.headers["set-cookie"])
-    morsel = cookie[routes.auth_settings.session_cookie_name]
-    return morsel.value
-
-
-def extract_cookie_morsel(response: Response):
-    cookie = SimpleCookie()
-    cookie.load(response.headers["set-cookie"])
-    return cookie[routes.auth_settings.session_cookie_name]
-
-
-@pytest.mark.anyio
-async def test_upload_rejects_invalid_seat():
-    payload = build_stdio_zip("print('hello')\n")
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("7", build_upload_file("bot.zip", payload))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "seat_id must be 1-6"
-
-
-@pytest.mark.anyio
-async def test_upload_rejects_non_zip():
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.txt", b"not a zip"))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "Only .zip bot uploads are supported"
-
-
-@pytest.mark.anyio
-async def test_upload_rejects_empty_payload():
+            "Archive contains multiple bot.json candidates",
+            id="multiple-bot-candidates",
+        ),
+        pytest.param(
+            "1",
+            "bot.zip",
+            build_zip({"bot.json": '{"command":["./missing.py"],"protocol_version":"2.0"}'}),
+            "bot.json command entry './missing.py' was not found in the archive",
+            id="missing-command-target",
+        ),
+        pytest.param(
+            "1",
+            "bot.zip",
+            build_zip({"bot.json": "{not-json}"}),
+            "bot.json must be valid JSON",
+            id="invalid-manifest-json",
+        ),
+        pytest.param(
+            "1",
+            "bot.zip",
+            build_zip(
+                {
+                    "bot.json": '{"command":["python","bot.py"],"protocol_version":"9.9"}',
+                    "bot.py": "print('hello')\n",
+                }
+            ),
+            "Unsupported protocol version '9.9'. Supported declared versions: 2.0",
+            id="unsupported-manifest-protocol",
+        ),
+    ],
+)
+async def test_upload_rejects_invalid_uploads(seat_id: str, filename: str, payload: bytes, detail: str):
     with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", b""))
+        await routes.upload_bot(seat_id, build_upload_file(filename, payload))
     assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "Upload payload is empty"
+    assert exc_info.value.detail == detail
 
 
 @pytest.mark.anyio
-async def test_upload_rejects_payloads_over_size_limit():
-    oversized_payload = b"x" * ((10 * 1024 * 1024) + 1)
+async def test_upload_rejects_payloads_over_size_limit(monkeypatch):
+    # The branch is the same at any limit; a small one avoids a 10 MB allocation per run.
+    monkeypatch.setattr(routes, "MAX_UPLOAD_BYTES", 1024)
     with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", oversized_payload))
+        await routes.upload_bot("1", build_upload_file("bot.zip", b"\0" * 1025))
     assert exc_info.value.status_code == 413
     assert exc_info.value.detail == "Upload exceeds 10MB limit"
 
 
-@pytest.mark.anyio
-async def test_upload_rejects_missing_bot_file():
-    payload = build_zip({"readme.txt": "no bot here"})
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", payload))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "bot.json must exist at zip root or one top-level folder"
-
-
 @pytest.mark.anyio
 async def test_upload_accepts_bot_file_in_single_top_level_folder():
     payload = build_stdio_zip(
@@ -232,92 +164,18 @@ json.dump({"action": "check" if "check" in legal else "fold"}, sys.stdout)
     assert response["seat"]["bot_name"] == "stdio.zip"
 
 
-@pytest.mark.anyio
-async def test_upload_rejects_invalid_zip_archive():
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", b"not-a-real-zip"))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "Upload is not a valid zip archive"
-
-
-@pytest.mark.anyio
-async def test_upload_rejects_unsafe_archive_paths():
-    payload = build_zip({"../bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}'})
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", payload))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "Archive contains unsafe paths"
-
-
-@pytest.mark.anyio
-async def test_upload_rejects_archives_with_multiple_bot_candidates():
-    payload = build_zip(
-        {
-            "bot_a/bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}',
-            "bot_b/bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}',
-        }
-    )
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", payload))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "Archive contains multiple bot.json candidates"
-
-
-@pytest.mark.anyio
-async def test_upload_rejects_stdio_manifest_with_missing_command_target():
-    payload = build_zip({"bot.json": '{"command":["./missing.py"],"protocol_version":"2.0"}'})
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", payload))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "bot.json command entry './missing.py' was not found in the archive"
-
-
 @pytest.mark.anyio
 async def test_upload_rejects_archives_with_too_many_files():
-    files = {f"file_{i}.txt": "x" for i in range(130)}
-    files["bot.json"] = '{"command":["python","bot.py"],"protocol_version":"2.0"}'
-    files["bot.py"] = "print('hello')\n"
-    payload = build_zip(files)
+    payload = TOO_MANY_FILES_ZIP
     with pytest.raises(HTTPException) as exc_info:
         await routes.upload_bot("1", build_upload_file("bot.zip", payload))
     assert exc_info.value.status_code == 400
     assert "Archive contains too many files" in exc_info.value.detail
 
 
-@pytest.mark.anyio
-async def test_upload_rejects_invalid_manifest_json():
-    payload = build_zip({"bot.json": "{not-json}"})
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", payload))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "bot.json must be valid JSON"
-
-
-@pytest.mark.anyio
-async def test_upload_rejects_unsupported_manifest_protocol():
-    payload = build_zip(
-        {
-            "bot.json": '{"command":["python","bot.py"],"protocol_version":"9.9"}',
-            "bot.py": "print('hello')\n",
-        }
-    )
-    with pytest.raises(HTTPException) as exc_info:
-        await routes.upload_bot("1", build_upload_file("bot.zip", payload))
-    assert exc_info.value.status_code == 400
-    assert exc_info.value.detail == "Unsupported protocol version '9.9'. Supported declared versions: 2.0"
-
-
 @pytest.mark.anyio
 async def test_uploads_start_match_and_expose_hands():
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+    payload = CHECK_BOT_ZIP
 
     response_a = await routes.upload_bot("1", build_upload_file("alpha.zip", payload))
     assert response_a["seat"]["ready"] is True
@@ -329,23 +187,16 @@ json.dump({"action": "check"}, sys.stdout)
     start_response = routes.start_match()
     assert start_response["match"]["status"] == "running"
 
-    deadline = time.monotonic() + 2.0
-    hands: list[dict] = []
-    hands_response: dict = {}
-    while time.monotonic() < deadline:
-        hands_response = routes.list_hands(page=1, page_size=5)
-        hands = hands_response["hands"]
-        if hands:
-            break
-        time.sleep(0.05)
-
-    assert hands, "Expected at least one hand to be generated"
+    hands_response = await routes.list_hands(page=1, page_size=5, after_hand_id=0, wait_seconds=2.0)
+    hands = hands_response["hands"]
+
+    assert hands
     assert hands_response["page"] == 1
     assert hands_response["page_size"] == 5
     assert hands_response["total_hands"] >= len(hands)
     assert hands_response["total_pages"] >= 1
 
-    snapshot_response = routes.list_hands(page=1, page_size=1, max_hand_id=1)
+    snapshot_response = await routes.list_hands(page=1, page_size=1, max_hand_id=1)
     assert snapshot_response["total_hands"] == 1
     assert snapshot_response["hands"][0]["hand_id"] == "1"
 
@@ -366,49 +217,67 @@ json.dump({"action": "check"}, sys.stdout)
     reset_response = routes.reset_match()
     assert reset_response["match"]["status"] == "waiting"
     assert all(not seat["ready"] for seat in routes.get_seats()["seats"])
-    assert routes.list_hands(page=1, page_size=5)["hands"] == []
+    assert (await routes.list_hands(page=1, page_size=5))["hands"] == []
+
+
+@pytest.mark.anyio
+async def test_list_hands_long_poll_times_out_with_no_new_hands():
+    response = await routes.list_hands(page=1, page_size=5, after_hand_id=0, wait_seconds=0.05)
+    assert response["hands"] == []
+    assert response["total_hands"] == 0
+
+
+@pytest.mark.anyio
+async def test_list_hands_answers_immediately_when_long_poll_slots_are_full(monkeypatch):
+    monkeypatch.setattr(routes, "_hands_wait_limiter", anyio.CapacityLimiter(1))
+    async with routes._hands_wait_limiter:
+        with anyio.fail_after(1):
+            response = await routes.list_hands(page=1, page_size=5, after_hand_id=0, wait_seconds=5.0)
+    assert response["hands"] == []
+
+
+@pytest.mark.anyio
+async def test_list_table_hands_looks_up_the_table_off_the_event_loop(monkeypatch):
+    lookup_threads = []
+
+    def recording_get_table_service(table_id: str):
+        lookup_threads.append(threading.current_thread())
+        return {}, routes.match_service
+
+    monkeypatch.setattr(routes, "get_table_service", recording_get_table_service)
+
+    response = await routes.list_table_hands("default", current_user={"username": "alice"})
+
+    assert response["hands"] == []
+    assert lookup_threads and lookup_threads[0] is not threading.current_thread()
+
+
+@pytest.mark.anyio
+async def test_list_hands_pages_over_retained_hands_and_404s_trimmed_ones(monkeypatch):
+    service = routes.match_service
+    monkeypatch.setattr(service, "MAX_RETAINED_HANDS", 4)
+    with service._lock:
+        for hand_number in range(1, 7):
+            service._append_hand_locked(make_hand(hand_number, winner="1", loser="2", amount=1.0))
+
+    response = await routes.list_hands(page=2, page_size=3)
+
+    assert [hand["hand_id"] for hand in response["hands"]] == ["3"]
+    assert response["total_hands"] == 4
+    assert response["total_pages"] == 2
+    with pytest.raises(HTTPException) as exc_info:
+        routes.get_hand("1")
+    assert exc_info.value.status_code == 404
 
 
 def test_get_pnl_returns_entries_and_last_hand_id():
     service = routes.match_service
-    now = datetime.now(timezone.utc)
     with service._lock:
-        service._hands = [
-            HandRecord(
-                hand_id="1",
-                completed_at=now,
-                summary="Hand #1",
-                winners=["1"],
-                pot=1.0,
-                history_path="1.txt",
-                deltas={
-                    "1": 1.0,
-                    "2": -1.0,
-                    "3": 0.0,
-                    "4": 0.0,
-                    "5": 0.0,
-                    "6": 0.0,
-                },
-                active_seats=["1", "2"],
-            ),
-            HandRecord(
-                hand_id="2",
-                completed_at=now,
-                summary="Hand #2",
-                winners=["2"],
-                pot=2.5,
-                history_path="2.txt",
-                deltas={
-                    "1": -2.5,
-                    "2": 2.5,
-                    "3": 0.0,
-                    "4": 0.0,
-                    "5": 0.0,
-                    "6": 0.0,
-                },
-                active_seats=["1", "2"],
-            ),
-        ]
+        for record in [
+            make_hand(1, winner="1", loser="2", amount=1.0),
+            make_hand(2, winner="2", loser="1", amount=2.5),
+        ]:
+            service._append_hand_locked(record)
 
     response = routes.get_pnl()
     assert response["last_hand_id"] == 2
@@ -438,6 +307,7 @@ def test_get_pnl_returns_entries_and_last_hand_id():
     ]
 
     response = routes.get_pnl(since_hand_id=1)
+    assert response["base"] == {**EMPTY_DELTAS, "1": 1.0, "2": -1.0}
     assert response["entries"] == [
         {
             "hand_id": 2,
@@ -474,17 +344,9 @@ def test_auth_login_success_and_me_returns_user():
 
 
 @pytest.mark.anyio
-async def test_my_bots_upload_and_list_success_for_authenticated_user():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+async def test_my_bots_upload_and_list_success_for_authenticated_user(alice):
+    current_user = alice
+    payload = CHECK_BOT_ZIP
 
     created = await routes.upload_my_bot(
         current_user=current_user,
@@ -513,10 +375,7 @@ def test_my_bots_endpoints_reject_unauthenticated_access():
     assert exc_info.value.detail == "Authentication required"
 
 
-def test_lobby_tables_list_and_create_success():
-    alice = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    bob = routes.auth_service.ensure_user("bob", "correct-horse-battery-staple")
-
+def test_lobby_tables_list_and_create_success(alice, bob):
     created = routes.create_lobby_table(
         payload=routes.CreateLobbyTableRequest(small_blind=0.5, big_blind=1.0),
         current_user=alice,
@@ -545,8 +404,8 @@ def test_lobby_tables_list_and_create_success():
     assert datetime.fromisoformat(listed_table["created_at"]).tzinfo is not None
 
 
-def test_lobby_tables_create_rejects_invalid_blinds():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
+def test_lobby_tables_create_rejects_invalid_blinds(alice):
+    current_user = alice
 
     with pytest.raises(HTTPException) as bad_blinds:
         routes.create_lobby_table(
@@ -557,10 +416,7 @@ def test_lobby_tables_create_rejects_invalid_blinds():
     assert bad_blinds.value.detail == "big_blind must be greater than small_blind"
 
 
-def test_lobby_tables_support_multi_table_lifecycle_listing():
-    alice = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    bob = routes.auth_service.ensure_user("bob", "correct-horse-battery-staple")
-
+def test_lobby_tables_support_multi_table_lifecycle_listing(alice, bob):
     created_alpha = routes.create_lobby_table(
         payload=routes.CreateLobbyTableRequest(small_blind=0.5, big_blind=1.0),
         current_user=alice,
@@ -591,17 +447,9 @@ def test_lobby_tables_support_multi_table_lifecycle_listing():
 
 
 @pytest.mark.anyio
-async def test_table_live_endpoints_are_isolated_per_table():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+async def test_table_live_endpoints_are_isolated_per_table(alice):
+    current_user = alice
+    payload = CHECK_BOT_ZIP
     alpha = await routes.upload_my_bot(
         current_user=current_user,
         bot_file=build_upload_file("alpha.zip", payload),
@@ -638,18 +486,13 @@ json.dump({"action": "check"}, sys.stdout)
     )
 
     _, first_service = routes.get_table_service(first_table["table_id"])
-    first_service.HAND_INTERVAL_SECONDS = 0.01
+    first_service.HAND_INTERVAL_SECONDS = 0
     started = routes.start_table_match(first_table["table_id"], current_user=current_user)
     assert started["match"]["table_id"] == first_table["table_id"]
     assert started["match"]["status"] == "running"
 
-    deadline = time.monotonic() + 2.0
-    first_hands = []
-    while time.monotonic() < deadline:
-        first_hands = routes.list_table_hands(first_table["table_id"], current_user=current_user)["hands"]
-        if first_hands:
-            break
-        time.sleep(0.05)
+    assert first_service.wait_for_hands(timeout=2.0)
+    first_hands = (await routes.list_table_hands(first_table["table_id"], current_user=current_user))["hands"]
     assert first_hands
 
     first_seats = routes.get_table_seats(first_table["table_id"], current_user=current_user)["seats"]
@@ -662,7 +505,7 @@ json.dump({"action": "check"}, sys.stdout)
     assert second_match["status"] == "waiting"
     assert second_match["hands_played"] == 0
 
-    second_hands = routes.list_table_hands(second_table["table_id"], current_user=current_user)["hands"]
+    second_hands = (await routes.list_table_hands(second_table["table_id"], current_user=current_user))["hands"]
     assert second_hands == []
 
     with pytest.raises(HTTPException) as missing_hand:
@@ -678,18 +521,8 @@ json.dump({"action": "check"}, sys.stdout)
 
 
 @pytest.mark.anyio
-async def test_my_bots_ownership_isolated_between_users():
-    alice = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    bob = routes.auth_service.ensure_user("bob", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+async def test_my_bots_ownership_isolated_between_users(alice, bob):
+    payload = CHECK_BOT_ZIP
 
     alice_bot = await routes.upload_my_bot(
         current_user=alice,
@@ -716,8 +549,8 @@ json.dump({"action": "check"}, sys.stdout)
 
 
 @pytest.mark.anyio
-async def test_my_bots_upload_rejects_invalid_payload():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
+async def test_my_bots_upload_rejects_invalid_payload(alice):
+    current_user = alice
 
     with pytest.raises(HTTPException) as non_zip:
         await routes.upload_my_bot(
@@ -732,7 +565,7 @@ async def test_my_bots_upload_rejects_invalid_payload():
     with pytest.raises(HTTPException) as empty_name:
         await routes.upload_my_bot(
             current_user=current_user,
-            bot_file=build_upload_file("bot.zip", build_stdio_zip("print('hello')\n")),
+            bot_file=build_upload_file("bot.zip", HELLO_BOT_ZIP),
             name="   ",
             version="1.0.0",
         )
@@ -751,17 +584,9 @@ async def test_my_bots_upload_rejects_invalid_payload():
 
 
 @pytest.mark.anyio
-async def test_seat_bot_select_supports_existing_owned_bot():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+async def test_seat_bot_select_supports_existing_owned_bot(alice):
+    current_user = alice
+    payload = CHECK_BOT_ZIP
     created = await routes.upload_my_bot(
         current_user=current_user,
         bot_file=build_upload_file("alpha.zip", payload),
@@ -782,18 +607,8 @@ json.dump({"action": "check"}, sys.stdout)
 
 
 @pytest.mark.anyio
-async def test_seat_bot_select_requires_ownership_and_valid_payload():
-    alice = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    bob = routes.auth_service.ensure_user("bob", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+async def test_seat_bot_select_requires_ownership_and_valid_payload(alice, bob):
+    payload = CHECK_BOT_ZIP
     created = await routes.upload_my_bot(
         current_user=bob,
         bot_file=build_upload_file("bob.zip", payload),
@@ -833,17 +648,9 @@ json.dump({"action": "check"}, sys.stdout)
 
 
 @pytest.mark.anyio
-async def test_lobby_leaderboard_updates_after_completed_hand():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+async def test_lobby_leaderboard_updates_after_completed_hand(alice):
+    current_user = alice
+    payload = CHECK_BOT_ZIP
     alpha = await routes.upload_my_bot(
         current_user=current_user,
         bot_file=build_upload_file("alpha.zip", payload),
@@ -869,8 +676,7 @@ json.dump({"action": "check"}, sys.stdout)
         current_user=current_user,
     )
 
-    with routes.match_service._lock:
-        routes.match_service._simulate_hand_locked()
+    routes.match_service._simulate_hand()
 
     leaderboard = routes.get_lobby_leaderboard(current_user=current_user)["leaderboard"]
     by_bot = {entry["bot_id"]: entry for entry in leaderboard}
@@ -884,66 +690,32 @@ json.dump({"action": "check"}, sys.stdout)
     )
 
 
-@pytest.mark.anyio
-async def test_lobby_leaderboard_is_sorted_by_bb_per_hand():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
-    alpha = await routes.upload_my_bot(
-        current_user=current_user,
-        bot_file=build_upload_file("alpha.zip", payload),
-        name="Alpha",
-        version="1.0.0",
-    )
-    beta = await routes.upload_my_bot(
-        current_user=current_user,
-        bot_file=build_upload_file("beta.zip", payload),
-        name="Beta",
-        version="1.0.0",
-    )
-    gamma = await routes.upload_my_bot(
-        current_user=current_user,
-        bot_file=build_upload_file("gamma.zip", payload),
-        name="Gamma",
-        version="1.0.0",
-    )
-    routes.auth_service.store.upsert_leaderboard_row(
-        bot_id=alpha["bot"]["bot_id"],
-        hands_played=10,
-        bb_won=25.0,
-        updated_at=1700000010,
-    )
-    routes.auth_service.store.upsert_leaderboard_row(
-        bot_id=beta["bot"]["bot_id"],
-        hands_played=10,
-        bb_won=5.0,
-        updated_at=1700000011,
-    )
-    routes.auth_service.store.upsert_leaderboard_row(
-        bot_id=gamma["bot"]["bot_id"],
-        hands_played=20,
-        bb_won=5.0,
-        updated_at=1700000012,
+def test_lobby_leaderboard_is_sorted_by_bb_per_hand(alice):
+    current_user = alice
+    store = routes.auth_service.store
+    for offset, bot_id in enumerate(("alpha", "beta", "gamma")):
+        store.create_bot_record(
+            bot_id=bot_id,
+            owner_user_id=current_user["user_id"],
+            name=bot_id.title(),
+            version="1.0.0",
+            artifact_path=f"/tmp/{bot_id}.zip",
+            now_ts=FIXED_TS + offset,
+        )
+    store.upsert_leaderboard_rows(
+        [
+            {"bot_id": "alpha", "hands_played": 10, "bb_won": 25.0, "updated_at": FIXED_TS + 10},
+            {"bot_id": "beta", "hands_played": 10, "bb_won": 5.0, "updated_at": FIXED_TS + 11},
+            {"bot_id": "gamma", "hands_played": 20, "bb_won": 5.0, "updated_at": FIXED_TS + 12},
+        ]
     )
 
     leaderboard = routes.get_lobby_leaderboard(current_user=current_user)["leaderboard"]
-    assert [entry["bot_id"] for entry in leaderboard] == [
-        alpha["bot"]["bot_id"],
-        beta["bot"]["bot_id"],
-        gamma["bot"]["bot_id"],
-    ]
+    assert [entry["bot_id"] for entry in leaderboard] == ["alpha", "beta", "gamma"]
 
 
-def test_lobby_leaderboard_handles_zero_hand_and_high_volume_rows():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    now_ts = int(datetime.now(timezone.utc).timestamp())
+def test_lobby_leaderboard_handles_zero_hand_and_high_volume_rows(alice):
+    current_user = alice
     store = routes.auth_service.store
 
     store.create_bot_record(
@@ -952,7 +724,7 @@ def test_lobby_leaderboard_handles_zero_hand_and_high_volume_rows():
         name="Zero",
         version="1.0.0",
         artifact_path="/tmp/zero.zip",
-        now_ts=now_ts,
+        now_ts=FIXED_TS,
     )
     store.create_bot_record(
         bot_id="bot-hi-pos",
@@ -960,7 +732,7 @@ def test_lobby_leaderboard_handles_zero_hand_and_high_volume_rows():
         name="High Positive",
         version="1.0.0",
         artifact_path="/tmp/hi-pos.zip",
-        now_ts=now_ts + 1,
+        now_ts=FIXED_TS + 1,
     )
     store.create_bot_record(
         bot_id="bot-hi-neg",
@@ -968,26 +740,15 @@ def test_lobby_leaderboard_handles_zero_hand_and_high_volume_rows():
         name="High Negative",
         version="1.0.0",
         artifact_path="/tmp/hi-neg.zip",
-        now_ts=now_ts + 2,
+        now_ts=FIXED_TS + 2,
     )
 
-    store.upsert_leaderboard_row(
-        bot_id="bot-zero",
-        hands_played=0,
-        bb_won=999999.0,
-        updated_at=now_ts + 3,
-    )
-    store.upsert_leaderboard_row(
-        bot_id="bot-hi-pos",
-        hands_played=1_000_000,
-        bb_won=25000.0,
-        updated_at=now_ts + 4,
-    )
-    store.upsert_leaderboard_row(
-        bot_id="bot-hi-neg",
-        hands_played=2_000_000,
-        bb_won=-10000.0,
-        updated_at=now_ts + 5,
+    store.upsert_leaderboard_rows(
+        [
+            {"bot_id": "bot-zero", "hands_played": 0, "bb_won": 999999.0, "updated_at": FIXED_TS + 3},
+            {"bot_id": "bot-hi-pos", "hands_played": 1_000_000, "bb_won": 25000.0, "updated_at": FIXED_TS + 4},
+            {"bot_id": "bot-hi-neg", "hands_played": 2_000_000, "bb_won": -10000.0, "updated_at": FIXED_TS + 5},
+        ]
     )
 
     leaderboard = routes.get_lobby_leaderboard(current_user=current_user)["leaderboard"]
@@ -1001,9 +762,8 @@ def test_lobby_leaderboard_handles_zero_hand_and_high_volume_rows():
     assert rows["bot-hi-neg"]["bb_per_hand"] == pytest.approx(-0.005)
 
 
-def test_lobby_leaderboard_persists_across_auth_service_restart():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    now_ts = int(datetime.now(timezone.utc).timestamp())
+def test_lobby_leaderboard_persists_across_auth_service_restart(alice):
+    current_user = alice
 
     routes.auth_service.store.create_bot_record(
         bot_id="persisted-bot",
@@ -1011,13 +771,13 @@ def test_lobby_leaderboard_persists_across_auth_service_restart():
         name="Persisted",
         version="1.0.0",
         artifact_path="/tmp/persisted.zip",
-        now_ts=now_ts,
+        now_ts=FIXED_TS,
     )
     routes.auth_service.store.upsert_leaderboard_row(
         bot_id="persisted-bot",
         hands_played=42,
         bb_won=10.5,
-        updated_at=now_ts + 1,
+        updated_at=FIXED_TS + 1,
     )
 
     original_auth_service = routes.auth_service
@@ -1074,17 +834,9 @@ def test_auth_login_failure_returns_401():
 
 
 @pytest.mark.anyio
-async def test_inline_upload_and_seat_selection_do_not_auto_start_match():
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
+async def test_inline_upload_and_seat_selection_do_not_auto_start_match(alice):
+    current_user = alice
+    payload = CHECK_BOT_ZIP
     alpha = await routes.upload_my_bot(
         current_user=current_user,
         bot_file=build_upload_file("alpha.zip", payload),
@@ -1137,7 +889,10 @@ def test_logout_invalidates_session():
     assert login_result["user"]["username"] == "alice"
     session_id = extract_session_cookie(response)
 
+    # One request carries the cookie through the before and after checks.
     logout_request = build_request_with_cookies({routes.auth_settings.session_cookie_name: session_id})
+    assert routes.require_authenticated_user(logout_request)["username"] == "alice"
+
     logout_response = Response()
     result = routes.logout(logout_request, logout_response)
     assert result["ok"] is True
@@ -1161,6 +916,21 @@ def test_login_bruteforce_lockout_behavior():
         routes.auth_service.login(username="alice", password="correct-horse-battery-staple")
 
 
+def test_login_lockout_expires_without_waiting():
+    now = [float(FIXED_TS)]
+    auth_service = AuthService(store=routes.auth_service.store, settings=routes.auth_settings, clock=lambda: now[0])
+    for _ in range(2):
+        with pytest.raises(AuthError):
+            auth_service.login(username="alice", password="wrong-password")
+    with pytest.raises(AuthLockedError) as lockout_error:
+        auth_service.login(username="alice", password="wrong-password")
+    assert lockout_error.value.retry_after_seconds == routes.auth_settings.login_lockout_seconds
+
+    now[0] += routes.auth_settings.login_lockout_seconds
+    user, _session = auth_service.login(username="alice", password="correct-horse-battery-staple")
+    assert user["username"] == "alice"
+
+
 def test_auth_cookie_secure_flag_is_disabled_for_local_http():
     response = Response()
     routes.login(
@@ -1168,8 +938,7 @@ def test_auth_cookie_secure_flag_is_disabled_for_local_http():
         response,
         build_request_with_cookies(host="localhost", scheme="http"),
     )
-    morsel = extract_cookie_morsel(response)
-    assert not morsel["secure"]
+    assert "secure" not in extract_cookie_attributes(response)
 
 
 def test_auth_cookie_secure_flag_is_enabled_for_forwarded_https():
@@ -1183,8 +952,7 @@ def test_auth_cookie_secure_flag_is_enabled_for_forwarded_https():
             extra_headers=[(b"x-forwarded-proto", b"https")],
         ),
     )
-    morsel = extract_cookie_morsel(response)
-    assert bool(morsel["secure"])
+    assert "secure" in extract_cookie_attributes(response)
 
 
 def test_registered_users_persist_across_auth_service_restart(tmp_path):
@@ -1199,6 +967,7 @@ def test_registered_users_persist_across_auth_service_restart(tmp_path):
         bootstrap_username="bootstrap",
         bootstrap_password="bootstrap-password",
         db_path=db_path,
+        password_hash_low_cost=True,
     )
 
     first_service = AuthService(store=AuthStore(db_path), settings=settings)
@@ -1212,6 +981,18 @@ def test_registered_users_persist_across_auth_service_restart(tmp_path):
     assert user["username"] == "durable-user"
 
 
+def test_password_hasher_default_cost_accepts_low_cost_hashes():
+    # Every other test hashes at minimum cost; this keeps the production parameters exercised.
+    hasher = PasswordHasher()
+    password_hash = hasher.hash_password("correct-horse-battery-staple")
+    assert hasher.verify_password(password_hash, "correct-horse-battery-staple")
+    assert not hasher.verify_password(password_hash, "wrong-password")
+
+    low_cost_hash = PasswordHasher(low_cost=True).hash_password("correct-horse-battery-staple")
+    assert low_cost_hash != password_hash
+    assert hasher.verify_password(low_cost_hash, "correct-horse-battery-staple")
+
+
 def test_auth_database_file_permissions_are_restricted(tmp_path):
     db_path = tmp_path / "auth.sqlite3"
     settings = AuthSettings(
@@ -1224,6 +1005,7 @@ def test_auth_database_file_permissions_are_restricted(tmp_path):
         bootstrap_username="bootstrap",
         bootstrap_password="bootstrap-password",
         db_path=db_path,
+        password_hash_low_cost=True,
     )
 
     service = AuthService(store=AuthStore(db_path), settings=settings)
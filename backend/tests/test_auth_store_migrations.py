@@ -83,8 +83,9 @@ def test_auth_store_upgrades_legacy_schema_without_losing_auth_data(tmp_path: Pa
     assert _schema_versions(db_path) == [1, 2]
 
 
-def test_table_and_leaderboard_data_persist_across_store_restart(tmp_path: Path) -> None:
-    db_path = tmp_path / "auth.sqlite3"
+def test_table_and_leaderboard_data_persist_across_store_restart(tmp_path: Path, auth_db_path: Path) -> None:
+    # Starts from the already-migrated session template; the tests above cover migrating.
+    db_path = auth_db_path
 
     first_store = AuthStore(db_path)
     user = first_store.create_user(username="owner", password_hash="hash", now_ts=1700000000)
@@ -123,3 +124,16 @@ def test_table_and_leaderboard_data_persist_across_store_restart(tmp_path: Path)
     assert leaderboard[0]["hands_played"] == 40
     assert leaderboard[0]["bb_won"] == 10.0
     assert leaderboard[0]["bb_per_hand"] == 0.25
+
+
+def test_get_session_user_skips_expired_and_invalidated_sessions(tmp_path: Path) -> None:
+    store = AuthStore(tmp_path / "auth.sqlite3")
+    user = store.create_user(username="alice", password_hash="hash", now_ts=1)
+    session = store.create_session(user_id=user["user_id"], now_ts=10, ttl_seconds=100)
+
+    assert store.get_session_user(session["session_id"], now_ts=50)["username"] == "alice"
+    assert store.get_session_user(session["session_id"], now_ts=110) is None
+    assert store.get_session_user("missing", now_ts=50) is None
+
+    store.invalidate_session(session["session_id"], now_ts=60)
+    assert store.get_session_user(session["session_id"], now_ts=70) is None
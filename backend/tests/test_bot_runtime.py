@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import os
 import stat
-import time
+import threading
 import zipfile
 from pathlib import Path
 
@@ -81,9 +81,12 @@ def test_prepare_bot_archive_rejects_unsafe_archive_path(tmp_path: Path) -> None
 
 
 def test_bot_runner_timeout_and_error() -> None:
+    release = threading.Event()
+
     class SlowBot:
         def act(self, state):
-            time.sleep(0.05)
+            # Blocks until the test is done rather than for a fixed time the runner must outlast.
+            release.wait()
             return {"action": "check"}
 
     class ErrorBot:
@@ -91,7 +94,11 @@ def test_bot_runner_timeout_and_error() -> None:
             raise RuntimeError("boom")
 
     slow_runner = BotRunner(bot=SlowBot(), seat_id="1", timeout_seconds=0.01)
-    result = slow_runner.act({"legal_actions": ["check"]})
+    try:
+        result = slow_runner.act({"legal_actions": ["check"]})
+    finally:
+        # Free the shared executor worker the timed-out call is still holding.
+        release.set()
     assert result["action"] == "fold"
     assert result.get("error") == "timeout"
 
@@ -1,150 +1,28 @@
-from http.cookies import SimpleCookie
-import io
-import json
 from pathlib import Path
-import zipfile
 
 import pytest
-from fastapi import HTTPException, Response
-from starlette.requests import Request
+from fastapi import FastAPI, HTTPException, Response
 
 from app.api import routes
-from app.auth.config import AuthSettings
-from app.auth.service import AuthService
-from app.auth.store import AuthStore
 from app.main import NoCacheStaticFiles, _resolve_asset_version, create_app
-from app.services.match_service import MatchService
-from app.services.table_runtime_manager import TableRuntimeManager
-from app.storage.hand_store import HandStore
-
-
-def build_runtime_callback(table_id: str, small_blind: float, big_blind: float):
-    del table_id
-    del small_blind
-    return lambda hand, seat_bot_ids: routes._update_persistent_leaderboard(
-        hand,
-        seat_bot_ids,
-        big_blind=big_blind,
-    )
-
-
-@pytest.fixture(autouse=True)
-def isolate_route_state(tmp_path, monkeypatch):
-    uploads_dir = tmp_path / "uploads"
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-    hands_root = tmp_path / "hands"
-
-    settings = AuthSettings(
-        session_cookie_name="ppg_session",
-        session_cookie_secure=None,
-        session_ttl_seconds=3600,
-        login_max_failures=3,
-        login_lockout_seconds=60,
-        login_failure_window_seconds=300,
-        bootstrap_username="bootstrap",
-        bootstrap_password="bootstrap-password",
-        db_path=Path(tmp_path / "auth.sqlite3"),
-    )
-    auth_service = AuthService(store=AuthStore(settings.db_path), settings=settings)
-    auth_service.ensure_user("alice", "correct-horse-battery-staple")
-
-    monkeypatch.setattr(routes, "uploads_dir", uploads_dir)
-    monkeypatch.setattr(
-        routes,
-        "match_service",
-        MatchService(
-            table_id="default",
-            hand_store=HandStore(base_dir=hands_root / "default"),
-            on_hand_completed=build_runtime_callback("default", 0.5, 1.0),
-        ),
-    )
-    monkeypatch.setattr(
-        routes,
-        "table_runtime_manager",
-        TableRuntimeManager(
-            hands_root=hands_root,
-            on_hand_completed_factory=build_runtime_callback,
-        ),
-    )
-    monkeypatch.setattr(routes, "auth_settings", settings)
-    monkeypatch.setattr(routes, "auth_service", auth_service)
-    yield
-    routes.match_service.reset_match()
-    for table_service in routes.table_runtime_manager._services.values():
-        table_service.reset_match()
-
-
-def build_request_with_cookies(cookies: dict[str, str] | None = None) -> Request:
-    headers: list[tuple[bytes, bytes]] = []
-    headers.append((b"host", b"localhost"))
-    if cookies:
-        cookie_header = "; ".join(f"{k}={v}" for k, v in cookies.items())
-        headers.append((b"cookie", cookie_header.encode("utf-8")))
-    scope = {
-        "type": "http",
-        "asgi.version": "3.0",
-        "method": "GET",
-        "path": "/",
-        "raw_path": b"/",
-        "query_string": b"",
-        "headers": headers,
-    }
-    return Request(scope)
-
-
-def build_page_request(path: str, cookies: dict[str, str] | None = None) -> Request:
-    headers: list[tuple[bytes, bytes]] = [(b"host", b"localhost")]
-    if cookies:
-        cookie_header = "; ".join(f"{k}={v}" for k, v in cookies.items())
-        headers.append((b"cookie", cookie_header.encode("utf-8")))
-    scope = {
-        "type": "http",
-        "asgi.version": "3.0",
-        "scheme": "http",
-        "method": "GET",
-        "path": path,
-        "raw_path": path.encode("utf-8"),
-        "query_string": b"",
-        "headers": headers,
-    }
-    return Request(scope)
-
-
-def extract_session_cookie(response: Response) -> str:
-    cookie = SimpleCookie()
-    cookie.load(response.headers["set-cookie"])
-    morsel = cookie[routes.auth_settings.session_cookie_name]
-    return morsel.value
-
-
-def build_zip(files: dict[str, str]) -> bytes:
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for name, content in files.items():
-            archive.writestr(name, content)
-    return buffer.getvalue()
-
-
-def build_stdio_zip(script: str) -> bytes:
-    return build_zip(
-        {
-            "bot.json": json.dumps({"command": ["python", "bot.py"], "protocol_version": "2.0"}),
-            "bot.py": script,
-        }
-    )
+from support import (
+    CHECK_BOT_ZIP,
+    build_page_request,
+    build_request_with_cookies,
+    build_upload_file,
+    extract_session_cookie,
+)
 
+pytestmark = pytest.mark.usefixtures("isolate_route_state")
 
-class FakeUploadFile:
-    def __init__(self, filename: str, payload: bytes):
-        self.filename = filename
-        self._payload = payload
 
-    async def read(self) -> bytes:
-        return self._payload
+@pytest.fixture(scope="module")
+def app() -> FastAPI:
+    """One app per module; create_app hashes every frontend file to version assets."""
+    return create_app()
 
 
-def get_page_endpoint(path: str):
-    app = create_app()
+def get_page_endpoint(app: FastAPI, path: str):
     for route in app.routes:
         if getattr(route, "path", None) == path and "GET" in getattr(route, "methods", set()):
             return route.endpoint
@@ -227,7 +105,7 @@ def test_frontend_asset_version_uses_content_hash_when_env_is_dev(monkeypatch):
         path="/tables/table-123",
         cookies={routes.auth_settings.session_cookie_name: session_id},
     )
-    page = get_page_endpoint("/tables/{table_id}")(page_request, table_id="table-123")
+    page = get_page_endpoint(create_app(), "/tables/{table_id}")(page_request, table_id="table-123")
     body = page.body.decode("utf-8")
     assert "/static/table-detail.js?v=" in body
     assert "/static/table-detail.js?v=dev" not in body
@@ -394,10 +272,10 @@ def test_playwright_frontend_suite_is_checked_in_with_runtime_isolation():
     assert "desktop and tablet can seat bots, run a match, and inspect history" in e2e_spec
 
 
-def test_frontend_login_redirect_for_protected_pages():
-    lobby_endpoint = get_page_endpoint("/lobby")
-    my_bots_endpoint = get_page_endpoint("/my-bots")
-    table_endpoint = get_page_endpoint("/tables/{table_id}")
+def test_frontend_login_redirect_for_protected_pages(app):
+    lobby_endpoint = get_page_endpoint(app, "/lobby")
+    my_bots_endpoint = get_page_endpoint(app, "/my-bots")
+    table_endpoint = get_page_endpoint(app, "/tables/{table_id}")
 
     lobby = lobby_endpoint(build_page_request(path="/lobby"))
     assert lobby.status_code == 302
@@ -412,7 +290,7 @@ def test_frontend_login_redirect_for_protected_pages():
     assert table_detail.headers["location"] == "/login"
 
 
-def test_frontend_my_bots_page_loads_for_authenticated_user():
+def test_frontend_my_bots_page_loads_for_authenticated_user(app):
     login_response = Response()
     routes.login(
         routes.LoginRequest(username="alice", password="correct-horse-battery-staple"),
@@ -424,7 +302,7 @@ def test_frontend_my_bots_page_loads_for_authenticated_user():
         path="/my-bots",
         cookies={routes.auth_settings.session_cookie_name: session_id},
     )
-    page = get_page_endpoint("/my-bots")(page_request)
+    page = get_page_endpoint(app, "/my-bots")(page_request)
     assert page.status_code == 200
     body = page.body.decode("utf-8")
     assert 'id="my-bots-open-upload"' in body
@@ -432,7 +310,7 @@ def test_frontend_my_bots_page_loads_for_authenticated_user():
     assert 'id="my-bots-upload-form"' in body
 
 
-def test_frontend_table_detail_page_loads_for_authenticated_user():
+def test_frontend_table_detail_page_loads_for_authenticated_user(app):
     login_response = Response()
     routes.login(
         routes.LoginRequest(username="alice", password="correct-horse-battery-staple"),
@@ -444,7 +322,7 @@ def test_frontend_table_detail_page_loads_for_authenticated_user():
         path="/tables/table-123",
         cookies={routes.auth_settings.session_cookie_name: session_id},
     )
-    page = get_page_endpoint("/tables/{table_id}")(page_request, table_id="table-123")
+    page = get_page_endpoint(app, "/tables/{table_id}")(page_request, table_id="table-123")
     assert page.status_code == 200
     body = page.body.decode("utf-8")
     assert 'id="table-id-label"' in body
@@ -453,20 +331,12 @@ def test_frontend_table_detail_page_loads_for_authenticated_user():
 
 
 @pytest.mark.anyio
-async def test_frontend_happy_path_upload_interaction():
-    payload = build_stdio_zip(
-        """
-import json
-import sys
-
-json.load(sys.stdin)
-json.dump({"action": "check"}, sys.stdout)
-"""
-    )
-    current_user = routes.auth_service.ensure_user("alice", "correct-horse-battery-staple")
+async def test_frontend_happy_path_upload_interaction(alice):
+    payload = CHECK_BOT_ZIP
+    current_user = alice
     upload = await routes.upload_my_bot(
         current_user=current_user,
-        bot_file=FakeUploadFile(filename="smoke.zip", payload=payload),
+        bot_file=build_upload_file("smoke.zip", payload),
         name="Smoke Bot",
         version="1.0.0",
     )
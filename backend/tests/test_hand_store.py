@@ -0,0 +1,129 @@
+import pytest
+
+from app.storage.hand_store import HandStore
+
+
+def test_hand_store_serves_saved_hands_before_and_after_flush(hand_store: HandStore) -> None:
+    hand_store.save_hand("1", "Hand #1")
+    assert hand_store.load_hand("1") == "Hand #1"
+
+    hand_store.flush()
+    assert hand_store.load_hand("1") == "Hand #1"
+    assert hand_store.load_hand("2") is None
+    assert hand_store.log_path.stat().st_size > 0
+
+
+def test_hand_store_starts_a_fresh_log_and_keeps_the_previous_one(open_hand_store) -> None:
+    store = open_hand_store()
+    store.save_hand("1", "Hand #1 ♠")
+    store.close()
+    previous_log = store.log_path.read_bytes()
+
+    reopened = open_hand_store()
+
+    assert reopened.load_hand("1") is None
+    assert reopened.log_path.stat().st_size == 0
+    assert (reopened.base_dir / HandStore.PREVIOUS_LOG_FILENAME).read_bytes() == previous_log
+
+
+def test_hand_store_clear_drains_pending_writes(hand_store: HandStore) -> None:
+    for hand_number in range(1, 101):
+        hand_store.save_hand(str(hand_number), f"Hand #{hand_number}")
+
+    hand_store.clear()
+
+    assert hand_store.load_hand("1") is None
+    assert hand_store.log_path.stat().st_size == 0
+
+
+def test_hand_store_overwrite_replaces_cached_history(hand_store: HandStore) -> None:
+    hand_store.save_hand("1", "first")
+    hand_store.flush()
+    assert hand_store.load_hand("1") == "first"
+
+    hand_store.save_hand("1", "second")
+    hand_store.flush()
+
+    assert hand_store.load_hand("1") == "second"
+
+
+def test_hand_store_retries_hands_after_a_failed_write(hand_store: HandStore, monkeypatch) -> None:
+    hand_store.save_hand("1", "Hand #1")
+    hand_store.flush()
+    good_size = hand_store.log_path.stat().st_size
+    real_write = hand_store._raw.write
+
+    def torn_write(data) -> int:
+        real_write(bytes(data[:3]))
+        raise OSError("disk full")
+
+    monkeypatch.setattr(hand_store._raw, "write", torn_write, raising=False)
+    hand_store.save_hand("2", "Hand #2")
+    hand_store.flush()
+    assert hand_store.load_hand("2") == "Hand #2"
+
+    monkeypatch.setattr(hand_store._raw, "write", real_write, raising=False)
+    hand_store.save_hand("3", "Hand #3")
+    hand_store.flush()
+
+    assert hand_store.log_path.stat().st_size > good_size
+    assert hand_store._pending == {}
+    hand_store._cache.clear()
+    assert [hand_store.load_hand(hand_id) for hand_id in ("1", "2", "3")] == ["Hand #1", "Hand #2", "Hand #3"]
+
+
+def test_hand_store_close_writes_queued_hands_and_stops_flusher(hand_store: HandStore) -> None:
+    hand_store.save_hand("1", "Hand #1")
+
+    hand_store.close()
+
+    assert not hand_store._flusher.is_alive()
+    assert hand_store.log_path.read_bytes().endswith(b"1Hand #1")
+
+
+def test_hand_store_rejects_unencodable_history_without_stalling_flush(hand_store: HandStore) -> None:
+    with pytest.raises(UnicodeEncodeError):
+        hand_store.save_hand("1", "bad \ud800 text")
+    hand_store.save_hand("2", "Hand #2")
+    hand_store.flush()
+
+    assert hand_store._flusher.is_alive()
+    assert hand_store.load_hand("1") is None
+    assert hand_store.load_hand("2") == "Hand #2"
+
+
+def test_hand_store_flusher_survives_unexpected_write_errors(hand_store: HandStore, monkeypatch) -> None:
+    real_write_all = hand_store._write_all
+    failures = iter([ValueError("unexpected")])
+
+    def flaky_write_all(data: bytes) -> None:
+        for error in failures:
+            raise error
+        real_write_all(data)
+
+    monkeypatch.setattr(hand_store, "_write_all", flaky_write_all)
+    hand_store.save_hand("1", "Hand #1")
+    hand_store.flush()
+    assert hand_store._flusher.is_alive()
+
+    hand_store.save_hand("2", "Hand #2")
+    hand_store.flush()
+
+    assert hand_store._pending == {}
+    assert [hand_store.load_hand(hand_id) for hand_id in ("1", "2")] == ["Hand #1", "Hand #2"]
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_hand_store_flush_returns_when_the_flusher_has_died(hand_store: HandStore, monkeypatch) -> None:
+    def fatal_write_batch(hand_ids: list[str]) -> None:
+        raise SystemExit
+
+    monkeypatch.setattr(hand_store, "_write_batch", fatal_write_batch)
+    hand_store.save_hand("1", "Hand #1")
+    hand_store._flusher.join(timeout=5)
+    hand_store.save_hand("2", "Hand #2")
+
+    hand_store.flush()
+
+    assert not hand_store._flusher.is_alive()
+    assert hand_store.load_hand("2") == "Hand #2"
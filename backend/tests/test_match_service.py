@@ -1,38 +1,56 @@
+import io
 import json
+import threading
 import zipfile
-from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from time import sleep
 
 import pytest
 
-from app.services.match_service import HandRecord, MatchService
+from app.engine.game import PokerEngine
+from app.services.match_service import HandRecord, MatchService, _hand_interval_from_env
 from app.storage.hand_store import HandStore
+from support import EMPTY_DELTAS, FIXED_NOW, make_hand
 
+# Checks when it can, otherwise calls or folds; used wherever a well-behaved bot is needed.
+PASSIVE_BOT_SOURCE = "\n".join(
+    [
+        "import json",
+        "import sys",
+        "state = json.load(sys.stdin)",
+        "legal = {entry['action'] for entry in state['legal_actions']}",
+        "json.dump({'action': 'check' if 'check' in legal else 'call' if 'call' in legal else 'fold'}, sys.stdout)",
+    ]
+)
 
-def _write_bot_zip(tmp_path: Path, name: str, body: str) -> Path:
-    zip_path = tmp_path / name
-    with zipfile.ZipFile(zip_path, "w") as archive:
+
+@lru_cache(maxsize=None)
+def _bot_zip_bytes(body: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
         archive.writestr("bot.json", json.dumps({"command": ["python", "bot.py"], "protocol_version": "2.0"}))
         archive.writestr("bot.py", body)
+    return buffer.getvalue()
+
+
+def _write_bot_zip(tmp_path: Path, name: str, body: str) -> Path:
+    zip_path = tmp_path / name
+    zip_path.write_bytes(_bot_zip_bytes(body))
     return zip_path
 
 
-def test_registering_both_seats_starts_match(tmp_path: Path) -> None:
-    service = MatchService(table_id="table-1", hand_store=HandStore(base_dir=tmp_path / "hands"))
+def _wait_for_hands(service: MatchService, timeout: float = 2.0) -> list[dict]:
+    service.wait_for_hands(timeout=timeout)
+    return service.list_hands(limit=10)
+
+
+def test_registering_both_seats_starts_match(tmp_path: Path, hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
     service.HAND_INTERVAL_SECONDS = 0.05
 
-    bot_body = "\n".join(
-        [
-            "import json",
-            "import sys",
-            "state = json.load(sys.stdin)",
-            "legal = {entry['action'] for entry in state['legal_actions']}",
-            "json.dump({'action': 'check' if 'check' in legal else 'call' if 'call' in legal else 'fold'}, sys.stdout)",
-        ]
-    )
-    bot_a = _write_bot_zip(tmp_path, "alpha.zip", bot_body)
-    bot_b = _write_bot_zip(tmp_path, "beta.zip", bot_body)
+    bot_a = _write_bot_zip(tmp_path, "alpha.zip", PASSIVE_BOT_SOURCE)
+    bot_b = _write_bot_zip(tmp_path, "beta.zip", PASSIVE_BOT_SOURCE)
 
     service.register_bot("1", "alpha.zip", bot_path=bot_a)
     service.register_bot("2", "beta.zip", bot_path=bot_b)
@@ -41,9 +59,8 @@ def test_registering_both_seats_starts_match(tmp_path: Path) -> None:
     assert match["status"] == "waiting"
 
     service.start_match()
-    sleep(0.15)
+    hands = _wait_for_hands(service)
     match = service.get_match()
-    hands = service.list_hands(limit=10)
 
     assert match["status"] == "running"
     assert len(hands) >= 1
@@ -67,27 +84,18 @@ def test_registering_both_seats_starts_match(tmp_path: Path) -> None:
     service.reset_match()
 
 
-def test_reset_match_clears_state(tmp_path: Path) -> None:
-    service = MatchService(table_id="table-1", hand_store=HandStore(base_dir=tmp_path / "hands"))
+def test_reset_match_clears_state(tmp_path: Path, hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
     service.HAND_INTERVAL_SECONDS = 0.05
 
-    bot_body = "\n".join(
-        [
-            "import json",
-            "import sys",
-            "state = json.load(sys.stdin)",
-            "legal = {entry['action'] for entry in state['legal_actions']}",
-            "json.dump({'action': 'check' if 'check' in legal else 'call' if 'call' in legal else 'fold'}, sys.stdout)",
-        ]
-    )
-    bot_a = _write_bot_zip(tmp_path, "alpha.zip", bot_body)
-    bot_b = _write_bot_zip(tmp_path, "beta.zip", bot_body)
+    bot_a = _write_bot_zip(tmp_path, "alpha.zip", PASSIVE_BOT_SOURCE)
+    bot_b = _write_bot_zip(tmp_path, "beta.zip", PASSIVE_BOT_SOURCE)
 
     service.register_bot("1", "alpha.zip", bot_path=bot_a)
     service.register_bot("2", "beta.zip", bot_path=bot_b)
 
     service.start_match()
-    sleep(0.1)
+    assert service.wait_for_hands(timeout=2.0)
     service.reset_match()
 
     match = service.get_match()
@@ -98,29 +106,19 @@ def test_reset_match_clears_state(tmp_path: Path) -> None:
     assert all(not seat["ready"] for seat in seats)
 
 
-def test_registering_stdio_bots_plays_hands(tmp_path: Path) -> None:
-    service = MatchService(table_id="table-1", hand_store=HandStore(base_dir=tmp_path / "hands"))
+def test_registering_stdio_bots_plays_hands(tmp_path: Path, hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
     service.HAND_INTERVAL_SECONDS = 0.05
 
-    bot_body = "\n".join(
-        [
-            "import json",
-            "import sys",
-            "state = json.load(sys.stdin)",
-            "legal = {entry['action'] for entry in state['legal_actions']}",
-            "json.dump({'action': 'check' if 'check' in legal else 'call' if 'call' in legal else 'fold'}, sys.stdout)",
-        ]
-    )
-    bot_a = _write_bot_zip(tmp_path, "alpha-stdio.zip", bot_body)
-    bot_b = _write_bot_zip(tmp_path, "beta-stdio.zip", bot_body)
+    bot_a = _write_bot_zip(tmp_path, "alpha-stdio.zip", PASSIVE_BOT_SOURCE)
+    bot_b = _write_bot_zip(tmp_path, "beta-stdio.zip", PASSIVE_BOT_SOURCE)
 
     service.register_bot("1", "alpha-stdio.zip", bot_path=bot_a)
     service.register_bot("2", "beta-stdio.zip", bot_path=bot_b)
 
     service.start_match()
-    sleep(0.15)
+    hands = _wait_for_hands(service)
     match = service.get_match()
-    hands = service.list_hands(limit=10)
 
     assert match["status"] == "running"
     assert len(hands) >= 1
@@ -128,23 +126,24 @@ def test_registering_stdio_bots_plays_hands(tmp_path: Path) -> None:
     service.reset_match()
 
 
-def test_list_hands_paginates_with_snapshot(tmp_path: Path) -> None:
-    service = MatchService(table_id="table-1", hand_store=HandStore(base_dir=tmp_path / "hands"))
-    now = datetime.now(timezone.utc)
+def test_list_hands_paginates_with_snapshot(hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
     with service._lock:
-        service._hands = [
+        for record in [
             HandRecord(
                 hand_id=str(hand_id),
-                completed_at=now,
+                hand_number=hand_id,
+                completed_at=FIXED_NOW,
                 summary=f"Hand #{hand_id}",
                 winners=["1"],
                 pot=1.0,
                 history_path=f"{hand_id}.txt",
-                deltas={str(seat_id): 0.0 for seat_id in range(1, 7)},
+                deltas=dict(EMPTY_DELTAS),
                 active_seats=["1", "2"],
             )
             for hand_id in range(1, 6)
-        ]
+        ]:
+            service._append_hand_locked(record)
 
     page_one = service.list_hands(page=1, page_size=2)
     assert [hand["hand_id"] for hand in page_one] == ["5", "4"]
@@ -157,67 +156,55 @@ def test_list_hands_paginates_with_snapshot(tmp_path: Path) -> None:
     assert [hand["hand_id"] for hand in snapshot_page] == ["3", "2"]
 
 
-def test_list_pnl_returns_deltas_and_last_hand_id(tmp_path: Path) -> None:
-    service = MatchService(table_id="table-1", hand_store=HandStore(base_dir=tmp_path / "hands"))
-    now = datetime.now(timezone.utc)
+def test_old_hands_are_trimmed_from_lists_but_still_counted_as_played(hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
+    service.MAX_RETAINED_HANDS = 4
     with service._lock:
-        service._hands = [
+        for record in [
             HandRecord(
-                hand_id="1",
-                completed_at=now,
-                summary="Hand #1",
+                hand_id=str(hand_id),
+                hand_number=hand_id,
+                completed_at=FIXED_NOW,
+                summary=f"Hand #{hand_id}",
                 winners=["1"],
                 pot=1.0,
-                history_path="1.txt",
-                deltas={
-                    "1": 1.0,
-                    "2": -1.0,
-                    "3": 0.0,
-                    "4": 0.0,
-                    "5": 0.0,
-                    "6": 0.0,
-                },
-                active_seats=["1", "2"],
-            ),
-            HandRecord(
-                hand_id="2",
-                completed_at=now,
-                summary="Hand #2",
-                winners=["2"],
-                pot=2.0,
-                history_path="2.txt",
-                deltas={
-                    "1": -2.0,
-                    "2": 2.0,
-                    "3": 0.0,
-                    "4": 0.0,
-                    "5": 0.0,
-                    "6": 0.0,
-                },
-                active_seats=["1", "2"],
-            ),
-            HandRecord(
-                hand_id="3",
-                completed_at=now,
-                summary="Hand #3",
-                winners=["1"],
-                pot=1.5,
-                history_path="3.txt",
-                deltas={
-                    "1": 1.5,
-                    "2": -1.5,
-                    "3": 0.0,
-                    "4": 0.0,
-                    "5": 0.0,
-                    "6": 0.0,
-                },
+                history_path=f"{hand_id}.txt",
+                deltas=dict(EMPTY_DELTAS),
                 active_seats=["1", "2"],
-            ),
-        ]
-
-    entries, last_hand_id = service.list_pnl()
-    assert last_hand_id == 3
-    assert entries == [
+            )
+            for hand_id in range(1, 7)
+        ]:
+            service._append_hand_locked(record)
+
+    assert service.get_match()["hands_played"] == 6
+    assert service.wait_for_hands(after=5, timeout=0)
+    assert not service.wait_for_hands(after=6, timeout=0.01)
+    assert [hand["hand_id"] for hand in service.list_hands(page=1, page_size=3)] == ["6", "5", "4"]
+    assert [hand["hand_id"] for hand in service.list_hands(page=2, page_size=3)] == ["3"]
+    assert service.count_hands() == 4
+    assert service.count_hands(max_hand_id=4) == 2
+    assert service.count_hands(max_hand_id=2) == 0
+    assert service.get_hand("2") is None
+    assert service.get_hand("3") is not None
+    pnl = service.list_pnl()
+    assert [entry["hand_id"] for entry in pnl["entries"]] == [3, 4, 5, 6]
+    assert pnl["last_hand_id"] == 6
+
+
+def test_list_pnl_returns_deltas_and_last_hand_id(hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
+    with service._lock:
+        for record in [
+            make_hand(1, winner="1", loser="2", amount=1.0),
+            make_hand(2, winner="2", loser="1", amount=2.0),
+            make_hand(3, winner="1", loser="2", amount=1.5),
+        ]:
+            service._append_hand_locked(record)
+
+    pnl = service.list_pnl()
+    assert pnl["last_hand_id"] == 3
+    assert pnl["base"] == dict(EMPTY_DELTAS)
+    assert pnl["entries"] == [
         {
             "hand_id": 1,
             "deltas": {
@@ -253,9 +240,10 @@ def test_list_pnl_returns_deltas_and_last_hand_id(tmp_path: Path) -> None:
         },
     ]
 
-    entries, last_hand_id = service.list_pnl(since_hand_id=1)
-    assert last_hand_id == 3
-    assert entries == [
+    pnl = service.list_pnl(since_hand_id=1)
+    assert pnl["last_hand_id"] == 3
+    assert pnl["base"] == {**EMPTY_DELTAS, "1": 1.0, "2": -1.0}
+    assert pnl["entries"] == [
         {
             "hand_id": 2,
             "deltas": {
@@ -312,20 +300,11 @@ def test_list_pnl_returns_deltas_and_last_hand_id(tmp_path: Path) -> None:
         ),
     ],
 )
-def test_runtime_supervisor_contains_bad_bots(tmp_path: Path, bot_body: str) -> None:
-    service = MatchService(table_id="table-1", hand_store=HandStore(base_dir=tmp_path / "hands"))
+def test_runtime_supervisor_contains_bad_bots(tmp_path: Path, hand_store: HandStore, bot_body: str) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
     service.HAND_INTERVAL_SECONDS = 0.01
 
-    stable_bot = "\n".join(
-        [
-            "import json",
-            "import sys",
-            "state = json.load(sys.stdin)",
-            "legal = {entry['action'] for entry in state['legal_actions']}",
-            "json.dump({'action': 'check' if 'check' in legal else 'call' if 'call' in legal else 'fold'}, sys.stdout)",
-        ]
-    )
-    bot_a = _write_bot_zip(tmp_path, "stable.zip", stable_bot)
+    bot_a = _write_bot_zip(tmp_path, "stable.zip", PASSIVE_BOT_SOURCE)
     bot_b = _write_bot_zip(tmp_path, "bad.zip", bot_body)
 
     service.register_bot("1", "stable.zip", bot_path=bot_a)
@@ -335,8 +314,7 @@ def test_runtime_supervisor_contains_bad_bots(tmp_path: Path, bot_body: str) ->
         service._bots["2"].timeout_seconds = 0.05
 
     service.start_match()
-    sleep(0.35)
-    hands = service.list_hands(limit=10)
+    hands = _wait_for_hands(service)
     match = service.get_match()
 
     assert match["status"] == "running"
@@ -345,7 +323,7 @@ def test_runtime_supervisor_contains_bad_bots(tmp_path: Path, bot_body: str) ->
     service.end_match()
 
 
-def test_match_loop_runtime_error_stops_match_safely(tmp_path: Path) -> None:
+def test_match_loop_runtime_error_stops_match_safely(tmp_path: Path, hand_store: HandStore) -> None:
     class ExplodingEngine:
         small_blind_cents = 50
         big_blind_cents = 100
@@ -355,7 +333,7 @@ def test_match_loop_runtime_error_stops_match_safely(tmp_path: Path) -> None:
 
     service = MatchService(
         table_id="table-1",
-        hand_store=HandStore(base_dir=tmp_path / "hands"),
+        hand_store=hand_store,
         engine=ExplodingEngine(),
     )
     service.HAND_INTERVAL_SECONDS = 0.01
@@ -381,48 +359,96 @@ def test_match_loop_runtime_error_stops_match_safely(tmp_path: Path) -> None:
     assert match["hands_played"] == 0
 
 
-def test_leaderboard_sorts_by_bb_per_hand(tmp_path: Path) -> None:
-    service = MatchService(table_id="table-1", hand_store=HandStore(base_dir=tmp_path / "hands"))
-    now = datetime.now(timezone.utc)
+def test_leaderboard_sorts_by_bb_per_hand(hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
     with service._lock:
         service._seats["1"].bot_name = "alpha"
         service._seats["2"].bot_name = "beta"
-        service._hands = [
-            HandRecord(
-                hand_id="1",
-                completed_at=now,
-                summary="Hand #1",
-                winners=["1"],
-                pot=2.0,
-                history_path="1.txt",
-                deltas={
-                    "1": 2.0,
-                    "2": -2.0,
-                    "3": 0.0,
-                    "4": 0.0,
-                    "5": 0.0,
-                    "6": 0.0,
-                },
-                active_seats=["1", "2"],
-            ),
-            HandRecord(
-                hand_id="2",
-                completed_at=now,
-                summary="Hand #2",
-                winners=["1"],
-                pot=1.0,
-                history_path="2.txt",
-                deltas={
-                    "1": 1.0,
-                    "2": -1.0,
-                    "3": 0.0,
-                    "4": 0.0,
-                    "5": 0.0,
-                    "6": 0.0,
-                },
-                active_seats=["1", "2"],
-            ),
-        ]
+        for record in [
+            make_hand(1, winner="1", loser="2", amount=2.0),
+            make_hand(2, winner="1", loser="2", amount=1.0),
+        ]:
+            service._append_hand_locked(record)
 
     leaderboard = service.get_leaderboard()
     assert [leader["seat_id"] for leader in leaderboard["leaders"]] == ["1", "2"]
+
+
+def test_get_match_returns_a_copy_of_the_snapshot(hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
+
+    service.get_match()["status"] = "running"
+
+    assert service.get_match()["status"] == "waiting"
+
+
+def test_loop_detached_mid_hand_cannot_publish_after_resume(tmp_path: Path, hand_store: HandStore) -> None:
+    first_hand_started = threading.Event()
+    release_first_hand = threading.Event()
+
+    class GatedEngine(PokerEngine):
+        def play_hand(self, **kwargs):  # noqa: ANN003 - test double
+            if not first_hand_started.is_set():
+                first_hand_started.set()
+                release_first_hand.wait()
+            return super().play_hand(**kwargs)
+
+    service = MatchService(
+        table_id="table-1",
+        hand_store=hand_store,
+        engine=GatedEngine(),
+    )
+    service.HAND_INTERVAL_SECONDS = 0
+    service.LOOP_JOIN_TIMEOUT_SECONDS = 0
+    # Folding ends each hand after one bot action.
+    fold_bot = "import json, sys\njson.load(sys.stdin)\njson.dump({'action': 'fold'}, sys.stdout)\n"
+    service.register_bot("1", "alpha.zip", bot_path=_write_bot_zip(tmp_path, "alpha.zip", fold_bot))
+    service.register_bot("2", "beta.zip", bot_path=_write_bot_zip(tmp_path, "beta.zip", fold_bot))
+
+    service.start_match()
+    assert first_hand_started.wait(timeout=2)
+    stale_loop = service._loop_thread
+    # pause_match returns while the stale loop is still inside its hand.
+    service.pause_match()
+    service.resume_match()
+    assert service.wait_for_hands(after=1, timeout=5)
+    release_first_hand.set()
+    stale_loop.join(timeout=5)
+    service.end_match()
+
+    hand_numbers = [int(hand["hand_id"]) for hand in reversed(service.list_hands(limit=1000))]
+    assert hand_numbers == list(range(1, len(hand_numbers) + 1))
+    assert service.get_hand("1") is not None
+    entries = service.list_pnl(since_hand_id=1)["entries"]
+    assert [entry["hand_id"] for entry in entries] == hand_numbers[1:]
+    service.close()
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [("0.25", 0.25), ("-3", 0.0), ("fast", 1.0), ("nan", 1.0), ("", 1.0)],
+)
+def test_hand_interval_env_falls_back_on_malformed_values(monkeypatch, raw: str, expected: float) -> None:
+    monkeypatch.setenv("APP_HAND_INTERVAL_SECONDS", raw)
+
+    assert _hand_interval_from_env() == expected
+
+
+def test_list_pnl_base_carries_trimmed_hands(hand_store: HandStore) -> None:
+    service = MatchService(table_id="table-1", hand_store=hand_store)
+    service.MAX_RETAINED_HANDS = 4
+    with service._lock:
+        for hand_number in range(1, 7):
+            service.hand_store.save_hand(str(hand_number), f"Hand #{hand_number} history")
+            service._append_hand_locked(make_hand(hand_number, winner="1", loser="2", amount=1.0))
+
+    pnl = service.list_pnl()
+    assert [entry["hand_id"] for entry in pnl["entries"]] == [3, 4, 5, 6]
+    assert pnl["base"] == {**EMPTY_DELTAS, "1": 2.0, "2": -2.0}
+    assert service.list_pnl(since_hand_id=6) == {
+        "base": {**EMPTY_DELTAS, "1": 6.0, "2": -6.0},
+        "entries": [],
+        "last_hand_id": 6,
+    }
+    assert service.get_hand("1") is None
+    service.close()
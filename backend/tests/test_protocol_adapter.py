@@ -4,13 +4,14 @@ import io
 import zipfile
 
 from app.bots.protocol import PROTOCOL_V2, build_decision_state
+from app.bots import security, validator
 from app.bots.validator import validate_bot_archive
 from app.engine.game import ActionEvent, Card
 
 
 def _build_zip(files: dict[str, str]) -> bytes:
     buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
         for name, content in files.items():
             archive.writestr(name, content)
     return buffer.getvalue()
@@ -181,3 +182,41 @@ def test_validate_bot_archive_rejects_stdio_manifest_with_missing_command_target
     is_valid, error = validate_bot_archive(payload)
     assert is_valid is False
     assert error == "bot.json command entry './missing.py' was not found in the archive"
+
+
+def test_validate_bot_archive_reuses_result_for_identical_payload(monkeypatch) -> None:
+    payload = _build_zip({"bot.json": '{"command":["./cached.py"],"protocol_version":"2.0"}'})
+    calls: list[bytes] = []
+    original = validator._validate_archive
+
+    def counting_validate(data: bytes) -> tuple[bool, str | None]:
+        calls.append(data)
+        return original(data)
+
+    monkeypatch.setattr(validator, "_validate_archive", counting_validate)
+
+    first = validate_bot_archive(payload)
+    second = validate_bot_archive(bytes(payload))
+    assert first == second == (False, "bot.json command entry './cached.py' was not found in the archive")
+    assert len(calls) == 1
+
+
+def test_validate_bot_archive_applies_limit_changes_after_cache_clear(monkeypatch) -> None:
+    payload = _build_zip(
+        {
+            "bot.json": '{"command":["python","bot.py"],"protocol_version":"2.0"}',
+            "bot.py": "print('limits')\n",
+        }
+    )
+    assert validate_bot_archive(payload) == (True, None)
+
+    monkeypatch.setattr(security, "MAX_ARCHIVE_MEMBERS", 1)
+    # Verdicts are cached by payload alone, so a changed limit needs a cleared cache.
+    validator._validation_cache.clear()
+    is_valid, error = validate_bot_archive(payload)
+    assert is_valid is False
+    assert error is not None
+
+    monkeypatch.undo()
+    validator._validation_cache.clear()
+    assert validate_bot_archive(payload) == (True, None)
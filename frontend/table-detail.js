@@ -324,7 +324,7 @@
     queuePnlRender(true);
   }
 
-  function applyPnlEntries(entries) {
+  function applyPnlEntries(entries, base = {}) {
     let hasChanges = false;
     entries.forEach((entry) => {
       const handId = Number(entry.hand_id);
@@ -336,9 +336,10 @@
       }
       seatIds.forEach((seatId) => {
         const delta = Number(entry.deltas?.[seatId]) || 0;
+        // Older hands are trimmed server-side; a fresh series starts from their cumulative base.
         const lastValue = pnlPoints[seatId].length
           ? pnlPoints[seatId][pnlPoints[seatId].length - 1].value
-          : 0;
+          : Number(base[seatId]) || 0;
         pnlPoints[seatId].push({ handId, value: lastValue + delta });
       });
       pnlLastHandId = handId;
@@ -418,7 +419,7 @@
       const query = params.toString();
       const response = await window.AppShell.request(`${tableApiPath("/pnl")}${query ? `?${query}` : ""}`);
       const entries = response.entries ?? [];
-      const pnlChanged = applyPnlEntries(entries);
+      const pnlChanged = applyPnlEntries(entries, response.base ?? {});
       if (response.last_hand_id !== null && response.last_hand_id !== undefined) {
         pnlLastHandId = response.last_hand_id;
       }